@@ -27,6 +27,10 @@ from services.audit_service import log_business_event
 
 logger = logging.getLogger(__name__)
 
+# Upload limits for contract files
+MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
 # Create router
 router = APIRouter(
     prefix="/api/contracts",
@@ -247,21 +251,24 @@ async def parse_contract(
             },
         )
 
-    # Read file bytes
-    file_bytes = await file.read()
-
-    # Validate file size (10MB limit)
-    max_size = 10 * 1024 * 1024  # 10MB
-    if len(file_bytes) > max_size:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail={
-                "success": False,
-                "error": "FileTooLarge",
-                "message": f"File size exceeds {max_size // (1024 * 1024)}MB limit",
-                "details": f"File size: {len(file_bytes) // (1024 * 1024)}MB",
-            },
-        )
+    # Read file bytes in chunks, stopping as soon as the size limit is passed
+    # so an oversized upload is never copied into memory in full
+    chunks = []
+    size = 0
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > MAX_UPLOAD_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail={
+                    "success": False,
+                    "error": "FileTooLarge",
+                    "message": f"File size exceeds {MAX_UPLOAD_SIZE // (1024 * 1024)}MB limit",
+                    "details": f"File size: more than {MAX_UPLOAD_SIZE // (1024 * 1024)}MB",
+                },
+            )
+        chunks.append(chunk)
+    file_bytes = b"".join(chunks)
 
     # Check for empty file
     if len(file_bytes) == 0:
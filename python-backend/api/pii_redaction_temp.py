@@ -15,7 +15,7 @@ from pydantic import BaseModel
 from typing import Dict, List, Optional
 
 from llama_parse import LlamaParse
-from services.pii_detector import PIIDetector, PIIDetectionError, PIIAnonymizationError
+from services.pii_detector import get_pii_detector, PIIDetectionError, PIIAnonymizationError
 from services.audit_service import log_business_event
 
 logger = logging.getLogger(__name__)
@@ -116,7 +116,7 @@ async def process_pii_redaction(request: Request, background_tasks: BackgroundTa
 
         # Step 2: Detect PII
         logger.info("PII Redaction: Detecting PII")
-        pii_detector = PIIDetector()
+        pii_detector = get_pii_detector()
         pii_entities = pii_detector.detect(raw_text)
         logger.info(f"PII Redaction: Detected {len(pii_entities)} entities")
 
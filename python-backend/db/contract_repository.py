@@ -9,7 +9,7 @@ import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from uuid import UUID
-from psycopg2.extras import Json
+from psycopg2.extras import Json, execute_values
 
 from .database import get_db_connection
 from .encryption import encrypt_pii_mapping, decrypt_pii_mapping, ENCRYPTION_METHOD
@@ -360,11 +360,31 @@ class ContractRepository:
                         project_id = result['project_id']
                         logger.debug(f"Looked up project_id={project_id} from contract {contract_id}")
 
+        clause_values = [
+            (
+                contract_id,
+                project_id,
+                clause.get('name'),
+                clause.get('section_ref'),
+                clause.get('raw_text'),
+                clause.get('summary'),
+                clause.get('beneficiary_party'),
+                clause.get('confidence_score'),
+                Json(clause.get('normalized_payload')) if clause.get('normalized_payload') else None,
+                clause.get('clause_type_id'),
+                clause.get('clause_category_id'),
+                clause.get('clause_responsibleparty_id'),
+                contract_amendment_id,
+            )
+            for clause in clauses
+        ]
+
         with get_db_connection() as conn:
             with conn.cursor() as cursor:
-                for clause in clauses:
-                    # Enhanced INSERT with all fields including FKs
-                    cursor.execute(
+                if clause_values:
+                    # One multi-row INSERT with all fields including FKs
+                    rows = execute_values(
+                        cursor,
                         """
                         INSERT INTO clause (
                             contract_id,
@@ -382,27 +402,15 @@ class ContractRepository:
                             contract_amendment_id,
                             created_at
                         )
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
+                        VALUES %s
                         RETURNING id
                         """,
-                        (
-                            contract_id,
-                            project_id,
-                            clause.get('name'),
-                            clause.get('section_ref'),
-                            clause.get('raw_text'),
-                            clause.get('summary'),
-                            clause.get('beneficiary_party'),
-                            clause.get('confidence_score'),
-                            Json(clause.get('normalized_payload')) if clause.get('normalized_payload') else None,
-                            clause.get('clause_type_id'),
-                            clause.get('clause_category_id'),
-                            clause.get('clause_responsibleparty_id'),
-                            contract_amendment_id,
-                        )
+                        clause_values,
+                        template="(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())",
+                        page_size=len(clause_values),
+                        fetch=True
                     )
-                    clause_id = cursor.fetchone()['id']
-                    clause_ids.append(clause_id)
+                    clause_ids = [row['id'] for row in rows]
 
             # Explicit commit before exiting connection context
             conn.commit()
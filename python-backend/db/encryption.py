@@ -74,8 +74,10 @@ def encrypt_pii_mapping(pii_mapping: Dict[str, Any]) -> bytes:
         # Get encryption key
         key = _get_encryption_key()
 
-        # Convert mapping to JSON bytes
-        plaintext = json.dumps(pii_mapping, ensure_ascii=False).encode('utf-8')
+        # Convert mapping to compact JSON bytes (no whitespace between tokens)
+        plaintext = json.dumps(
+            pii_mapping, ensure_ascii=False, separators=(',', ':')
+        ).encode('utf-8')
 
         # Generate random nonce (12 bytes for GCM)
         nonce = os.urandom(12)
@@ -10,7 +10,7 @@ from typing import Optional, List, Dict, Any
 import logging
 
 from db.database import get_db_connection
-from psycopg2.extras import Json
+from psycopg2.extras import Json, execute_values
 
 logger = logging.getLogger(__name__)
 
@@ -148,6 +148,70 @@ class EventRepository:
             logger.error(f"Failed to create event: {e}")
             return None
 
+    def create_events_bulk(self, events: List[Dict[str, Any]]) -> List[int]:
+        """
+        Create multiple operational event records in one round trip.
+
+        Args:
+            events: List of dicts with the create_event() keyword arguments
+                (project_id, event_type_id, time_start, time_end, raw_data,
+                description, and optionally metric_outcome and status)
+
+        Returns:
+            List of event.id values in input order (empty on failure)
+        """
+        if not events:
+            return []
+
+        query = """
+            INSERT INTO event (
+                project_id,
+                event_type_id,
+                time_start,
+                time_end,
+                raw_data,
+                metric_outcome,
+                description,
+                status,
+                created_at
+            )
+            VALUES %s
+            RETURNING id
+        """
+        values = [
+            (
+                event['project_id'],
+                event['event_type_id'],
+                event['time_start'],
+                event['time_end'],
+                Json(event['raw_data']),
+                Json(event['metric_outcome']) if event.get('metric_outcome') else None,
+                event['description'],
+                event.get('status', 'open'),
+            )
+            for event in events
+        ]
+
+        try:
+            with get_db_connection() as conn:
+                with conn.cursor() as cursor:
+                    rows = execute_values(
+                        cursor,
+                        query,
+                        values,
+                        template="(%s, %s, %s, %s, %s, %s, %s, %s, NOW())",
+                        page_size=len(values),
+                        fetch=True
+                    )
+                    event_ids = [row['id'] for row in rows]
+
+            logger.info(f"Created {len(event_ids)} events in bulk")
+            return event_ids
+
+        except Exception as e:
+            logger.error(f"Failed to create events in bulk: {e}")
+            return []
+
     def get_events(
         self,
         project_id: Optional[int] = None,
@@ -217,6 +217,53 @@ class OntologyRepository:
             direction='target'
         )
 
+    def get_excuses_for_contract(
+        self,
+        contract_id: int
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Get EXCUSES relationships for every clause of a contract in one query.
+
+        Args:
+            contract_id: Contract ID
+
+        Returns:
+            Dict mapping target clause ID to its EXCUSES relationship dicts
+            (same shape as get_excuses_for_clause)
+        """
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT
+                        cr.id,
+                        cr.source_clause_id,
+                        cr.target_clause_id,
+                        cr.relationship_type::TEXT,
+                        cr.is_cross_contract,
+                        cr.parameters,
+                        cr.is_inferred,
+                        cr.confidence,
+                        sc.name AS source_clause_name,
+                        scc.code AS source_category_code,
+                        tc.name AS target_clause_name,
+                        tcc.code AS target_category_code
+                    FROM clause_relationship cr
+                    JOIN clause sc ON sc.id = cr.source_clause_id
+                    JOIN clause tc ON tc.id = cr.target_clause_id
+                    LEFT JOIN clause_category scc ON scc.id = sc.clause_category_id
+                    LEFT JOIN clause_category tcc ON tcc.id = tc.clause_category_id
+                    WHERE cr.relationship_type = 'EXCUSES'::relationship_type
+                      AND tc.contract_id = %s
+                    ORDER BY cr.confidence DESC NULLS LAST
+                    """,
+                    (contract_id,)
+                )
+                excuses: Dict[int, List[Dict[str, Any]]] = {}
+                for row in cursor.fetchall():
+                    excuses.setdefault(row['target_clause_id'], []).append(dict(row))
+                return excuses
+
     def get_triggers_for_clause(self, clause_id: int) -> List[Dict[str, Any]]:
         """
         Get all clauses triggered by breach of the given clause.
@@ -605,3 +652,24 @@ class OntologyRepository:
                     params
                 )
                 return [dict(row) for row in cursor.fetchall()]
+
+
+class PrefetchedOntologyRepository:
+    """
+    Request-scoped OntologyRepository view with EXCUSES preloaded per contract.
+
+    Serves get_excuses_for_clause() from memory so rules evaluated for the
+    same contract share one query; all other calls go to the wrapped
+    repository.
+    """
+
+    def __init__(self, repository: OntologyRepository, contract_id: int):
+        self._repository = repository
+        self._excuses = repository.get_excuses_for_contract(contract_id)
+
+    def get_excuses_for_clause(self, clause_id: int) -> List[Dict[str, Any]]:
+        """Get EXCUSES relationships targeting the clause (in-memory lookup)."""
+        return self._excuses.get(clause_id, [])
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._repository, name)
@@ -10,7 +10,7 @@ from decimal import Decimal
 import logging
 
 from db.database import get_db_connection
-from psycopg2.extras import Json
+from psycopg2.extras import Json, execute_values
 
 logger = logging.getLogger(__name__)
 
@@ -141,35 +141,15 @@ class RulesRepository:
             logger.error(f"Failed to create default_event: {e}")
             return None
 
-    def create_rule_output(
-        self,
-        default_event_id: int,
-        project_id: int,
-        clause_id: int,
+    @staticmethod
+    def _rule_output_description_and_metadata(
         rule_type: str,
         calculated_value: Optional[float],
         threshold_value: Optional[float],
         shortfall: Optional[float],
-        ld_amount: Optional[Decimal],
         output_detail: Dict[str, Any]
-    ) -> Optional[int]:
-        """
-        Create a rule output record.
-
-        Args:
-            default_event_id: Parent default event ID
-            project_id: Project ID
-            clause_id: Clause that was evaluated
-            rule_type: 'availability', 'capacity_factor', 'pricing'
-            calculated_value: Calculated metric value
-            threshold_value: Threshold from contract
-            shortfall: Difference (threshold - calculated)
-            ld_amount: Liquidated damages amount
-            output_detail: JSONB with calculation details
-
-        Returns:
-            rule_output.id or None on failure
-        """
+    ) -> tuple:
+        """Build the rule_output description and JSONB metadata."""
         # Generate description
         if rule_type == 'availability':
             description = f"Availability: {calculated_value:.2f}% (target: {threshold_value}%)"
@@ -202,6 +182,40 @@ class RulesRepository:
             'shortfall': shortfall,
             **output_detail
         })
+        return description, metadata
+
+    def create_rule_output(
+        self,
+        default_event_id: int,
+        project_id: int,
+        clause_id: int,
+        rule_type: str,
+        calculated_value: Optional[float],
+        threshold_value: Optional[float],
+        shortfall: Optional[float],
+        ld_amount: Optional[Decimal],
+        output_detail: Dict[str, Any]
+    ) -> Optional[int]:
+        """
+        Create a rule output record.
+
+        Args:
+            default_event_id: Parent default event ID
+            project_id: Project ID
+            clause_id: Clause that was evaluated
+            rule_type: 'availability', 'capacity_factor', 'pricing'
+            calculated_value: Calculated metric value
+            threshold_value: Threshold from contract
+            shortfall: Difference (threshold - calculated)
+            ld_amount: Liquidated damages amount
+            output_detail: JSONB with calculation details
+
+        Returns:
+            rule_output.id or None on failure
+        """
+        description, metadata = self._rule_output_description_and_metadata(
+            rule_type, calculated_value, threshold_value, shortfall, output_detail
+        )
 
         query = """
             INSERT INTO rule_output (
@@ -370,6 +384,163 @@ class RulesRepository:
             logger.error(f"Failed to create notification: {e}")
             return None
 
+    def store_breaches_bulk(
+        self,
+        breaches: List[Dict[str, Any]]
+    ) -> List[Dict[str, int]]:
+        """
+        Store breaches (default_event + rule_output + notification) in one
+        transaction with one multi-row INSERT per table.
+
+        Args:
+            breaches: List of dicts with keys:
+                - default_event: create_default_event() keyword arguments
+                - rule_output: create_rule_output() keyword arguments
+                  (without default_event_id)
+                - notification: dict with project_id, description,
+                  metadata_detail
+
+        Returns:
+            List of dicts with default_event_id, rule_output_id and
+            notification_id, in input order
+
+        Raises:
+            ValueError: If two breaches share a clause_id (rows are matched
+                back to their breach by clause_id)
+            Exception: If any insert fails (the whole batch is rolled back)
+        """
+        if not breaches:
+            return []
+
+        # Postgres does not guarantee RETURNING order for multi-row INSERTs,
+        # so each RETURNING clause carries a key the rows are matched on
+        clause_ids = [str(breach['rule_output']['clause_id']) for breach in breaches]
+        if len(set(clause_ids)) != len(clause_ids):
+            raise ValueError(f"Duplicate clause_id in breach batch: {clause_ids}")
+
+        default_event_values = []
+        for breach, clause_id in zip(breaches, clause_ids):
+            de = breach['default_event']
+            if str(de['metadata_detail'].get('clause_id')) != clause_id:
+                raise ValueError(
+                    f"default_event metadata_detail clause_id does not match "
+                    f"rule_output clause_id {clause_id}"
+                )
+            default_event_values.append((
+                de['project_id'],
+                de['contract_id'],
+                de['time_start'],
+                de['status'],
+                Json(de['metadata_detail']),
+                de.get('description'),
+                de.get('event_id'),
+            ))
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                rows = execute_values(
+                    cursor,
+                    """
+                    INSERT INTO default_event (
+                        project_id, contract_id, time_start, status,
+                        metadata_detail, description, event_id, created_at
+                    )
+                    VALUES %s
+                    RETURNING id, metadata_detail->>'clause_id' AS clause_id
+                    """,
+                    default_event_values,
+                    template="(%s, %s, %s, %s, %s, %s, %s, NOW())",
+                    page_size=len(default_event_values),
+                    fetch=True
+                )
+                ids_by_clause = {row['clause_id']: row['id'] for row in rows}
+                default_event_ids = [ids_by_clause[clause_id] for clause_id in clause_ids]
+
+                rule_output_values = []
+                for breach, default_event_id in zip(breaches, default_event_ids):
+                    ro = breach['rule_output']
+                    description, metadata = self._rule_output_description_and_metadata(
+                        ro['rule_type'],
+                        ro['calculated_value'],
+                        ro['threshold_value'],
+                        ro['shortfall'],
+                        ro['output_detail'],
+                    )
+                    rule_output_values.append((
+                        default_event_id,
+                        ro['project_id'],
+                        ro['clause_id'],
+                        1,  # rule_output_type_id = 1 (Liquidated Damages)
+                        1,  # currency_id = 1 (USD)
+                        description,
+                        Json(metadata),
+                        ro['ld_amount'],
+                        True,  # breach
+                    ))
+
+                rows = execute_values(
+                    cursor,
+                    """
+                    INSERT INTO rule_output (
+                        default_event_id, project_id, clause_id,
+                        rule_output_type_id, currency_id, description,
+                        metadata_detail, ld_amount, breach, created_at
+                    )
+                    VALUES %s
+                    RETURNING id, default_event_id
+                    """,
+                    rule_output_values,
+                    template="(%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())",
+                    page_size=len(rule_output_values),
+                    fetch=True
+                )
+                ids_by_default_event = {row['default_event_id']: row['id'] for row in rows}
+                rule_output_ids = [ids_by_default_event[de_id] for de_id in default_event_ids]
+
+                notification_values = [
+                    (
+                        breach['notification']['project_id'],
+                        default_event_id,
+                        rule_output_id,
+                        breach['notification']['description'],
+                        Json(breach['notification']['metadata_detail']),
+                    )
+                    for breach, default_event_id, rule_output_id
+                    in zip(breaches, default_event_ids, rule_output_ids)
+                ]
+
+                rows = execute_values(
+                    cursor,
+                    """
+                    INSERT INTO notification (
+                        project_id, default_event_id, rule_output_id,
+                        description, metadata_detail, created_at
+                    )
+                    VALUES %s
+                    RETURNING id, rule_output_id
+                    """,
+                    notification_values,
+                    template="(%s, %s, %s, %s, %s, NOW())",
+                    page_size=len(notification_values),
+                    fetch=True
+                )
+                ids_by_rule_output = {row['rule_output_id']: row['id'] for row in rows}
+                notification_ids = [ids_by_rule_output[ro_id] for ro_id in rule_output_ids]
+
+        logger.info(
+            f"Stored {len(default_event_ids)} breaches "
+            f"(default_event + rule_output + notification) in one transaction"
+        )
+        return [
+            {
+                'default_event_id': default_event_id,
+                'rule_output_id': rule_output_id,
+                'notification_id': notification_id,
+            }
+            for default_event_id, rule_output_id, notification_id
+            in zip(default_event_ids, rule_output_ids, notification_ids)
+        ]
+
     def get_default_events(
         self,
         project_id: Optional[int] = None,
@@ -38,6 +38,7 @@ class TestFullPipelineExtraction:
             extraction_mode="two_pass",
             enable_targeted=True,
             enable_validation=True,
+            cache_results=True,
         )
         pdf_bytes = Path(source_file).read_bytes()
         result = parser.process_contract(pdf_bytes, source_file)
@@ -65,7 +66,12 @@ class TestFullPipelineExtraction:
         if not source_file or not Path(source_file).exists():
             pytest.skip(f"Source PDF not found: {source_file}")
 
-        parser = ContractParser(extraction_mode="two_pass", enable_targeted=True, enable_validation=True)
+        parser = ContractParser(
+            extraction_mode="two_pass",
+            enable_targeted=True,
+            enable_validation=True,
+            cache_results=True,
+        )
         result = parser.process_contract(Path(source_file).read_bytes(), source_file)
         pred_clauses = [c.model_dump() for c in result.clauses]
 
@@ -86,7 +92,12 @@ class TestFullPipelineExtraction:
         if not source_file or not Path(source_file).exists():
             pytest.skip(f"Source PDF not found: {source_file}")
 
-        parser = ContractParser(extraction_mode="two_pass", enable_targeted=True, enable_validation=True)
+        parser = ContractParser(
+            extraction_mode="two_pass",
+            enable_targeted=True,
+            enable_validation=True,
+            cache_results=True,
+        )
         result = parser.process_contract(Path(source_file).read_bytes(), source_file)
         pred_clauses = [c.model_dump() for c in result.clauses]
 
@@ -104,7 +115,12 @@ class TestFullPipelineExtraction:
         if not source_file or not Path(source_file).exists():
             pytest.skip(f"Source PDF not found: {source_file}")
 
-        parser = ContractParser(extraction_mode="two_pass", enable_targeted=True, enable_validation=True)
+        parser = ContractParser(
+            extraction_mode="two_pass",
+            enable_targeted=True,
+            enable_validation=True,
+            cache_results=True,
+        )
         result = parser.process_contract(Path(source_file).read_bytes(), source_file)
         pred_clauses = [c.model_dump() for c in result.clauses]
 
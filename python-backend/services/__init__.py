@@ -2,7 +2,7 @@
 Services for contract processing, PII detection, and parsing.
 """
 
-from .pii_detector import PIIDetector, PIIDetectionError, PIIAnonymizationError
+from .pii_detector import PIIDetector, PIIDetectionError, PIIAnonymizationError, get_pii_detector
 from .contract_parser import (
     ContractParser,
     ContractParserError,
@@ -14,6 +14,7 @@ __all__ = [
     "PIIDetector",
     "PIIDetectionError",
     "PIIAnonymizationError",
+    "get_pii_detector",
     "ContractParser",
     "ContractParserError",
     "DocumentParsingError",
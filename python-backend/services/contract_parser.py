@@ -13,19 +13,22 @@ This service ensures PII detection happens AFTER document parsing but BEFORE
 sending any data to Claude API, preventing PII exposure to external AI services.
 """
 
+import hashlib
 import logging
 import re
+import threading
 import time
 import os
 import json
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
 from llama_parse import LlamaParse
 from anthropic import Anthropic
 
 from config.settings import CLAUDE_MODEL
-from services.pii_detector import PIIDetector, PIIDetectionError
+from services.pii_detector import get_pii_detector, PIIDetectionError
 
 
 def _extract_json_block(text: str, strict: bool = True) -> str:
@@ -163,6 +166,14 @@ TOKEN_BUDGETS = {
 }
 
 
+# Exact-match cache of process_contract() results for parsers created with
+# cache_results=True, keyed by SHA-256 of the file plus extraction settings.
+# Shared across instances (the API and scripts build a parser per file).
+PARSE_RESULT_CACHE_SIZE = 32
+_parse_result_cache: "OrderedDict[Tuple, ContractParseResult]" = OrderedDict()
+_parse_result_cache_lock = threading.Lock()
+
+
 class ContractParserError(Exception):
     """Raised when contract parsing fails."""
     pass
@@ -202,7 +213,8 @@ class ContractParser:
         use_database: bool = False,
         extraction_mode: str = "two_pass",
         enable_validation: bool = True,
-        enable_targeted: bool = True
+        enable_targeted: bool = True,
+        cache_results: bool = False
     ):
         """
         Initialize parser with external API clients.
@@ -215,6 +227,9 @@ class ContractParser:
                 - "hybrid": Both methods merged for maximum recall (most API calls)
             enable_validation: If True, run validation pass to catch missed clauses
             enable_targeted: If True, run targeted extraction for missing categories
+            cache_results: If True, process_contract() returns the stored result
+                for a file it has already parsed with the same settings instead
+                of calling LlamaParse and Claude again
 
         Raises:
             ContractParserError: If API keys are missing or initialization fails
@@ -229,10 +244,11 @@ class ContractParser:
         self.extraction_mode = extraction_mode
         self.enable_validation = enable_validation
         self.enable_targeted = enable_targeted
+        self.cache_results = cache_results
 
         try:
             # Initialize PII detector (local)
-            self.pii_detector = PIIDetector()
+            self.pii_detector = get_pii_detector()
 
             # Initialize LlamaParse client
             llama_api_key = os.getenv("LLAMA_CLOUD_API_KEY")
@@ -341,6 +357,20 @@ class ContractParser:
         start_time = time.time()
         logger.info(f"Starting contract parsing for file: {filename}")
 
+        cache_key = None
+        if self.cache_results:
+            cache_key = (
+                hashlib.sha256(file_bytes).hexdigest(),
+                self.extraction_mode, self.enable_validation, self.enable_targeted,
+            )
+            with _parse_result_cache_lock:
+                cached = _parse_result_cache.get(cache_key)
+                if cached is not None:
+                    _parse_result_cache.move_to_end(cache_key)
+            if cached is not None:
+                logger.info(f"Returning cached parse result for file: {filename}")
+                return cached.model_copy(deep=True)
+
         try:
             # Step 1: Parse document with LlamaParse (gets raw text)
             logger.info("Step 1: Parsing document with LlamaParse")
@@ -380,6 +410,12 @@ class ContractParser:
                 f"{len(clauses)} clauses, {anonymized_result.pii_count} PII redacted"
             )
 
+            if cache_key is not None:
+                with _parse_result_cache_lock:
+                    _parse_result_cache[cache_key] = result.model_copy(deep=True)
+                    while len(_parse_result_cache) > PARSE_RESULT_CACHE_SIZE:
+                        _parse_result_cache.popitem(last=False)
+
             return result
 
         except (DocumentParsingError, ClauseExtractionError) as e:
@@ -8,7 +8,7 @@ Analyzes time-series meter readings to detect:
 """
 
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
 import pandas as pd
 
@@ -27,9 +27,15 @@ class EventDetector:
     equipment failures, performance issues, and grid outages.
     """
 
-    def __init__(self):
-        """Initialize event detector with meter aggregator and event repository."""
-        self.meter_aggregator = MeterAggregator()
+    def __init__(self, meter_aggregator: Optional[MeterAggregator] = None):
+        """
+        Initialize event detector with meter aggregator and event repository.
+
+        Args:
+            meter_aggregator: Optional aggregator to share (and share its
+                meter readings cache) with the caller
+        """
+        self.meter_aggregator = meter_aggregator or MeterAggregator()
         self.event_repo = EventRepository()
 
     def detect_events(
@@ -8,8 +8,9 @@ Supports both legacy schema (single 'value' column via meter join) and
 new canonical schema (energy_wh, power_w, etc. with source_system).
 """
 
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import pandas as pd
 import logging
 
@@ -17,6 +18,15 @@ from db.database import get_db_connection
 
 logger = logging.getLogger(__name__)
 
+# Output column -> SELECT expression for the core load_meter_readings columns
+_METER_READING_COLUMNS = {
+    'reading_timestamp': "mr.reading_timestamp",
+    'value': "COALESCE(mr.energy_wh, mr.value) as value",  # Backward compat
+    'meter_id': "mr.meter_id",
+    'unit_of_measure': "COALESCE(m.unit, 'Wh') as unit_of_measure",
+    'source_system': "COALESCE(mr.source_system, 'legacy') as source_system",
+}
+
 
 class MeterAggregator:
     """
@@ -28,8 +38,61 @@ class MeterAggregator:
     Supports both:
     - Legacy schema: meter_reading joined to meter/meter_type tables
     - New canonical schema: partitioned meter_reading with source_system
+
+    load_meter_readings() results are kept in a small per-instance LRU cache
+    so repeated loads of the same period (event detection followed by rule
+    evaluation, backfills re-running a period) skip the database. Call
+    invalidate_cache() after writing meter readings through a long-lived
+    instance.
     """
 
+    def __init__(self, cache_size: int = 64):
+        """
+        Args:
+            cache_size: Max cached load_meter_readings() results (0 disables)
+        """
+        self._cache_size = cache_size
+        self._readings_cache: "OrderedDict[Tuple, pd.DataFrame]" = OrderedDict()
+
+    def invalidate_cache(self, project_id: Optional[int] = None) -> None:
+        """
+        Drop cached meter readings.
+
+        Args:
+            project_id: Only drop entries for this project (all if None)
+        """
+        if project_id is None:
+            self._readings_cache.clear()
+            return
+        for key in [k for k in self._readings_cache if k[0] == project_id]:
+            del self._readings_cache[key]
+
+    def _get_cached_readings(
+        self,
+        key: Tuple,
+        columns: Optional[List[str]]
+    ) -> Optional[pd.DataFrame]:
+        """Return a copy of a cached result, projecting from a full load if needed."""
+        cached = self._readings_cache.get(key)
+        if cached is not None:
+            self._readings_cache.move_to_end(key)
+            return cached.copy()
+
+        if columns is not None:
+            full = self._readings_cache.get(key[:-1] + (None,))
+            if full is not None:
+                self._readings_cache.move_to_end(key[:-1] + (None,))
+                return full[[c for c in full.columns if c in columns]].copy()
+        return None
+
+    def _store_cached_readings(self, key: Tuple, df: pd.DataFrame) -> None:
+        if self._cache_size <= 0:
+            return
+        self._readings_cache[key] = df.copy()
+        self._readings_cache.move_to_end(key)
+        while len(self._readings_cache) > self._cache_size:
+            self._readings_cache.popitem(last=False)
+
     def load_meter_readings(
         self,
         project_id: int,
@@ -38,7 +101,8 @@ class MeterAggregator:
         period_end: datetime,
         source_systems: Optional[List[str]] = None,
         include_quality: bool = False,
-        include_extended_metrics: bool = False
+        include_extended_metrics: bool = False,
+        columns: Optional[List[str]] = None
     ) -> pd.DataFrame:
         """
         Load meter readings for a project and period.
@@ -53,6 +117,9 @@ class MeterAggregator:
             include_quality: If True, include 'quality' column in output
             include_extended_metrics: If True, include power_w, irradiance_wm2,
                                      temperature_c columns
+            columns: Optional subset of the core columns (reading_timestamp,
+                     value, meter_id, unit_of_measure, source_system) to
+                     select. If None, all core columns are loaded.
 
         Returns:
             DataFrame with columns:
@@ -64,14 +131,30 @@ class MeterAggregator:
                 - quality (str) - if include_quality=True
                 - power_w, irradiance_wm2, temperature_c - if include_extended_metrics=True
         """
-        # Build dynamic column selection
-        select_columns = [
-            "mr.reading_timestamp",
-            "COALESCE(mr.energy_wh, mr.value) as value",  # Backward compat
-            "mr.meter_id",
-            "COALESCE(m.unit, 'Wh') as unit_of_measure",
-            "COALESCE(mr.source_system, 'legacy') as source_system",
+        cache_key = (
+            project_id,
+            meter_type,
+            period_start,
+            period_end,
+            tuple(source_systems) if source_systems else None,
+            include_quality,
+            include_extended_metrics,
+            tuple(sorted(columns)) if columns is not None else None,
+        )
+        cached = self._get_cached_readings(cache_key, columns)
+        if cached is not None:
+            logger.info(
+                f"Loaded {len(cached)} meter readings for project {project_id} "
+                f"from cache, period {period_start} to {period_end}"
+            )
+            return cached
+
+        # Build dynamic column selection (only the requested core columns)
+        core_columns = [
+            name for name in _METER_READING_COLUMNS
+            if columns is None or name in columns
         ]
+        select_columns = [_METER_READING_COLUMNS[name] for name in core_columns]
 
         if include_quality:
             select_columns.append("COALESCE(mr.quality, 'measured') as quality")
@@ -131,9 +214,11 @@ class MeterAggregator:
             if rows:
                 df = pd.DataFrame(rows)
                 # Convert value column to numeric (handle Decimal types)
-                df['value'] = pd.to_numeric(df['value'], errors='coerce')
+                if 'value' in df.columns:
+                    df['value'] = pd.to_numeric(df['value'], errors='coerce')
                 # Ensure timestamp column is datetime
-                df['reading_timestamp'] = pd.to_datetime(df['reading_timestamp'])
+                if 'reading_timestamp' in df.columns:
+                    df['reading_timestamp'] = pd.to_datetime(df['reading_timestamp'])
 
                 # Convert extended metrics if present
                 if include_extended_metrics:
@@ -142,12 +227,9 @@ class MeterAggregator:
                             df[col] = pd.to_numeric(df[col], errors='coerce')
             else:
                 # Return empty DataFrame with expected columns
-                columns = ['reading_timestamp', 'value', 'meter_id', 'unit_of_measure', 'source_system']
-                if include_quality:
-                    columns.append('quality')
-                if include_extended_metrics:
-                    columns.extend(['power_w', 'irradiance_wm2', 'temperature_c', 'reading_interval_seconds'])
-                df = pd.DataFrame(columns=columns)
+                df = pd.DataFrame(columns=self._empty_meter_reading_columns(
+                    core_columns, include_quality, include_extended_metrics
+                ))
 
             source_filter_msg = f", sources {source_systems}" if source_systems else ""
             logger.info(
@@ -155,6 +237,7 @@ class MeterAggregator:
                 f"type '{meter_type}'{source_filter_msg}, period {period_start} to {period_end}"
             )
 
+            self._store_cached_readings(cache_key, df)
             return df
 
         except Exception as e:
@@ -162,12 +245,23 @@ class MeterAggregator:
                 f"Failed to load meter readings for project {project_id}: {e}"
             )
             # Return empty DataFrame with expected columns
-            columns = ['reading_timestamp', 'value', 'meter_id', 'unit_of_measure', 'source_system']
-            if include_quality:
-                columns.append('quality')
-            if include_extended_metrics:
-                columns.extend(['power_w', 'irradiance_wm2', 'temperature_c', 'reading_interval_seconds'])
-            return pd.DataFrame(columns=columns)
+            return pd.DataFrame(columns=self._empty_meter_reading_columns(
+                core_columns, include_quality, include_extended_metrics
+            ))
+
+    @staticmethod
+    def _empty_meter_reading_columns(
+        core_columns: List[str],
+        include_quality: bool,
+        include_extended_metrics: bool
+    ) -> List[str]:
+        """Column list for an empty load_meter_readings() result."""
+        columns = list(core_columns)
+        if include_quality:
+            columns.append('quality')
+        if include_extended_metrics:
+            columns.extend(['power_w', 'irradiance_wm2', 'temperature_c', 'reading_interval_seconds'])
+        return columns
 
     def load_meter_readings_by_source(
         self,
@@ -292,7 +386,7 @@ class MeterAggregator:
                 - event_id (int)
                 - time_start (datetime)
                 - time_end (datetime)
-                - event_type (str)
+                - event_type (category of str codes)
                 - description (str)
         """
         # Build query with optional type filter
@@ -338,6 +432,8 @@ class MeterAggregator:
                 df = pd.DataFrame(columns=[
                     'event_id', 'time_start', 'time_end', 'event_type', 'description'
                 ])
+            # Few distinct codes: rules filter on the integer category codes
+            df['event_type'] = df['event_type'].astype('category')
 
             logger.info(
                 f"Loaded {len(df)} excused events for project {project_id}, "
@@ -14,8 +14,10 @@ missing, hardcoded defaults are used as a fallback.
 """
 
 from presidio_analyzer import AnalyzerEngine, Pattern, PatternRecognizer, RecognizerResult
+from presidio_analyzer.nlp_engine import NlpEngineProvider
 from presidio_anonymizer import AnonymizerEngine
 from presidio_anonymizer.entities import OperatorConfig
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Set, Tuple
 import logging
 import os
@@ -29,6 +31,9 @@ from models.contract import PIIEntity, AnonymizedResult
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# spaCy pipeline components PII detection does not use
+SPACY_DISABLED_PIPES = ("parser",)
+
 # Default config used when pii_config.yaml is missing
 _DEFAULT_CONFIG: Dict[str, Any] = {
     "detection": {
@@ -280,8 +285,16 @@ class PIIDetector:
                 re.MULTILINE,
             )
 
-            # Initialize Presidio engines
-            self.analyzer = AnalyzerEngine()
+            # Initialize Presidio engines. The NLP engine is Presidio's
+            # default (spaCy en_core_web_lg); its dependency parser is disabled
+            # because Presidio reads only tokens, lemmas and entities (the
+            # tagger and attribute_ruler stay: the lemmatizer depends on them)
+            nlp_engine = NlpEngineProvider().create_engine()
+            for nlp in nlp_engine.nlp.values():
+                for pipe in SPACY_DISABLED_PIPES:
+                    if pipe in nlp.pipe_names:
+                        nlp.disable_pipe(pipe)
+            self.analyzer = AnalyzerEngine(nlp_engine=nlp_engine)
             self.anonymizer = AnonymizerEngine()
 
             # Add custom recognizers from config
@@ -863,3 +876,15 @@ class PIIDetector:
         logger.debug(f"Created {len(mapping)} PII mappings")
 
         return mapping
+
+
+@lru_cache(maxsize=1)
+def get_pii_detector() -> PIIDetector:
+    """
+    Shared PIIDetector with the default configuration.
+
+    Building a detector loads the spaCy model behind Presidio's analyzer,
+    which takes seconds; the detector holds no per-call state, so callers
+    reuse one instance built on first use.
+    """
+    return PIIDetector()
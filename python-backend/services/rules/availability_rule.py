@@ -8,10 +8,11 @@ during an evaluation period, accounting for excused events.
 from datetime import datetime
 from decimal import Decimal
 from typing import Dict, Any
+import numpy as np
 import pandas as pd
 import logging
 
-from services.rules.base_rule import BaseRule
+from services.rules.base_rule import BaseRule, meter_column_values
 from models.contract import RuleResult
 
 logger = logging.getLogger(__name__)
@@ -66,7 +67,7 @@ class AvailabilityRule(BaseRule):
         )
 
         # Calculate actual operating hours (where meter value > 0)
-        if meter_data.empty:
+        if len(meter_data) == 0:
             logger.warning(
                 f"No meter data for availability calculation "
                 f"(clause {self.clause_id}, period {period_start} to {period_end})"
@@ -88,14 +89,15 @@ class AvailabilityRule(BaseRule):
 
         # Count hours where value > 0 (plant was operating)
         # Note: Meter data is assumed to be hourly or sub-hourly readings
-        operating_mask = meter_data['value'] > 0
-        operating_hours = operating_mask.sum()
+        # (NaN compares False, so missing readings count as not operating)
+        operating_readings = int(np.count_nonzero(meter_column_values(meter_data, 'value') > 0))
+        operating_hours = float(operating_readings)
 
         # Handle sub-hourly data (e.g., 15-minute intervals)
         if len(meter_data) > total_hours:
             # Assume evenly spaced readings, scale to hours
             readings_per_hour = len(meter_data) / total_hours
-            operating_hours = operating_mask.sum() / readings_per_hour
+            operating_hours = operating_readings / readings_per_hour
 
         # Calculate availability percentage
         denominator = total_hours - excused_hours
@@ -10,16 +10,97 @@ Integrates with ontology layer for:
 """
 
 from abc import ABC, abstractmethod
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import cached_property
 from typing import Optional, Dict, Any, List, Set
 from decimal import Decimal
+import numpy as np
 import pandas as pd
 import logging
+import threading
 
 from models.contract import RuleResult
 
 logger = logging.getLogger(__name__)
 
+_MICROSECONDS_PER_HOUR = 3.6e9
+
+
+def meter_column_values(meter_data: pd.DataFrame, column: str) -> np.ndarray:
+    """float64 ndarray of one meter data column, with nulls as NaN."""
+    return meter_data[column].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _event_type_mask(event_types: pd.Series, excused_types: Set[str]) -> np.ndarray:
+    """
+    Boolean mask of events whose type is in excused_types.
+
+    Categorical columns (as loaded by MeterAggregator.load_excused_events)
+    are matched on their integer codes; other columns fall back to isin().
+    """
+    if isinstance(event_types.dtype, pd.CategoricalDtype):
+        wanted_codes = np.flatnonzero(event_types.cat.categories.isin(excused_types))
+        return np.isin(event_types.cat.codes.to_numpy(), wanted_codes)
+    return event_types.isin(excused_types).to_numpy()
+
+
+def _to_epoch_us(values: pd.Series) -> np.ndarray:
+    """Convert a timestamp column to int64 microseconds since epoch (UTC)."""
+    ts = pd.to_datetime(values)
+    if ts.dt.tz is not None:
+        ts = ts.dt.tz_convert('UTC').dt.tz_localize(None)
+    return ts.to_numpy(dtype='datetime64[us]').astype(np.int64)
+
+
+def _bound_to_epoch_us(value: datetime) -> int:
+    """Convert a period boundary to int64 microseconds since epoch (UTC)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return int(np.datetime64(value, 'us').astype(np.int64))
+
+
+def _overlap_hours(
+    starts_us: np.ndarray, ends_us: np.ndarray, ps_us: int, pe_us: int
+) -> float:
+    """
+    Hours covered by the union of events clamped to [ps_us, pe_us).
+
+    Inputs must be sorted by start. Each event contributes only the time it
+    extends past the running end of the events before it, so overlapping
+    events are never double-counted.
+    """
+    starts = np.maximum(starts_us, ps_us)
+    ends = np.minimum(ends_us, pe_us)
+    running_end = np.maximum.accumulate(ends)
+    previous_end = np.concatenate(([ps_us], running_end[:-1]))
+    added = running_end - np.maximum(starts, previous_end)
+    return float(added[added > 0].sum()) / _MICROSECONDS_PER_HOUR
+
+
+class ExcusedHoursCache:
+    """
+    Excused hours memoized by (excuse types, period start, period end).
+
+    Created by RulesEngine for one evaluate_period call and shared by the
+    rules it evaluates, which may run on several threads, so access is
+    guarded by a lock. It is not tied to the excused_events frame: the
+    engine discards it together with the frame when the evaluation ends.
+    """
+
+    def __init__(self):
+        self._hours: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[float]:
+        """Cached hours for key, or None if not computed yet."""
+        with self._lock:
+            return self._hours.get(key)
+
+    def set(self, key: tuple, hours: float) -> None:
+        """Store hours computed for key."""
+        with self._lock:
+            self._hours[key] = hours
+
 
 class BaseRule(ABC):
     """
@@ -29,7 +110,16 @@ class BaseRule(ABC):
     class and implements the evaluate() method with specific calculation logic.
     """
 
-    def __init__(self, clause: Dict[str, Any], ontology_repo=None):
+    # meter_data columns read by evaluate(); the engine loads only the union
+    # of these across the rules it runs
+    REQUIRED_COLUMNS = ('reading_timestamp', 'value')
+
+    def __init__(
+        self,
+        clause: Dict[str, Any],
+        ontology_repo=None,
+        excused_hours_cache: Optional[ExcusedHoursCache] = None
+    ):
         """
         Initialize rule with clause data.
 
@@ -41,6 +131,8 @@ class BaseRule(ABC):
                 - contract_id: Parent contract ID
                 - project_id: Project ID
             ontology_repo: Optional OntologyRepository for relationship queries
+            excused_hours_cache: Optional ExcusedHoursCache shared by the
+                rules of one evaluation (no memoization when omitted)
         """
         self.clause = clause
         self.clause_id = clause['id']
@@ -50,6 +142,7 @@ class BaseRule(ABC):
         self.params = clause.get('normalized_payload', {})
         self._ontology_repo = ontology_repo
         self._excuse_types_cache: Optional[Set[str]] = None
+        self._excused_hours_cache = excused_hours_cache
 
     @property
     def ontology_repo(self):
@@ -179,56 +272,83 @@ class BaseRule(ABC):
             )
             return 0.0
 
-        # Filter to relevant event types
-        relevant_events = excused_events[
-            excused_events['event_type'].isin(excused_types)
-        ]
-
-        if relevant_events.empty:
+        # Reuse hours another clause of this evaluation already computed for
+        # the same excuse types and period
+        cache = self._excused_hours_cache
+        cache_key = (frozenset(excused_types), period_start, period_end)
+        if cache is not None:
+            cached_hours = cache.get(cache_key)
+            if cached_hours is not None:
+                return cached_hours
+
+        # Keep events of a relevant type that overlap the period, as one
+        # vectorized mask over the epoch arrays
+        type_mask = _event_type_mask(excused_events['event_type'], excused_types)
+        if not type_mask.any():
+            if cache is not None:
+                cache.set(cache_key, 0.0)
             return 0.0
 
-        # Calculate hours for each event (clamped to period boundaries)
-        total_hours = 0.0
-        for _, event in relevant_events.iterrows():
-            event_start = max(event['time_start'], period_start)
-            event_end = min(event['time_end'], period_end)
+        starts_us = _to_epoch_us(excused_events['time_start'])
+        ends_us = _to_epoch_us(excused_events['time_end'])
+        ps_us = _bound_to_epoch_us(period_start)
+        pe_us = _bound_to_epoch_us(period_end)
+        mask = type_mask & (ends_us > ps_us) & (starts_us < pe_us)
 
-            if event_end > event_start:
-                duration = (event_end - event_start).total_seconds() / 3600
-                total_hours += duration
+        # Calculate hours covered by events (clamped to period boundaries,
+        # overlapping events merged so shared hours are counted once)
+        starts_us = starts_us[mask]
+        ends_us = ends_us[mask]
+        order = np.argsort(starts_us, kind='stable')
+        starts_us = starts_us[order]
+        ends_us = ends_us[order]
+
+        total_hours = _overlap_hours(starts_us, ends_us, ps_us, pe_us)
 
         logger.debug(
-            f"Calculated {total_hours:.2f} excused hours from {len(relevant_events)} events "
+            f"Calculated {total_hours:.2f} excused hours from {len(starts_us)} events "
             f"(excuse types: {excused_types})"
         )
+        if cache is not None:
+            cache.set(cache_key, total_hours)
         return total_hours
 
-    def _get_ld_parameters(self) -> Dict[str, Any]:
+    @cached_property
+    def ld_parameters(self) -> Dict[str, Any]:
         """
-        Extract LD calculation parameters from normalized_payload.
+        LD calculation parameters parsed once from normalized_payload.
 
         Returns:
             Dict with keys:
                 - ld_per_point: Decimal ($/percentage point)
                 - ld_cap_annual: Optional[Decimal] (max LD per year)
                 - ld_cap_period: Optional[Decimal] (max LD per period)
+                - ld_cap_effective: Optional[Decimal] (period cap, else annual cap)
                 - ld_currency: str (USD, EUR, etc.)
         """
+        ld_cap_annual = (
+            Decimal(str(self.params['ld_cap_annual']))
+            if 'ld_cap_annual' in self.params
+            else None
+        )
+        ld_cap_period = (
+            Decimal(str(self.params['ld_cap_period']))
+            if 'ld_cap_period' in self.params
+            else None
+        )
         return {
             'ld_per_point': Decimal(str(self.params.get('ld_per_point', 0))),
-            'ld_cap_annual': (
-                Decimal(str(self.params['ld_cap_annual']))
-                if 'ld_cap_annual' in self.params
-                else None
-            ),
-            'ld_cap_period': (
-                Decimal(str(self.params['ld_cap_period']))
-                if 'ld_cap_period' in self.params
-                else None
-            ),
+            'ld_cap_annual': ld_cap_annual,
+            'ld_cap_period': ld_cap_period,
+            # A zero cap means "no cap", matching the historical `or` semantics
+            'ld_cap_effective': ld_cap_period or ld_cap_annual or None,
             'ld_currency': self.params.get('ld_currency', 'USD'),
         }
 
+    def _get_ld_parameters(self) -> Dict[str, Any]:
+        """Extract LD calculation parameters (see ld_parameters)."""
+        return self.ld_parameters
+
     def _calculate_ld_amount(
         self,
         shortfall: float,
@@ -252,8 +372,11 @@ class BaseRule(ABC):
         # Calculate raw LD
         ld_amount = Decimal(str(shortfall)) * ld_params['ld_per_point']
 
-        # Apply caps if specified
-        cap = ld_params.get('ld_cap_period') or ld_params.get('ld_cap_annual')
+        # Apply the tightest configured cap
+        if 'ld_cap_effective' in ld_params:
+            cap = ld_params['ld_cap_effective']
+        else:
+            cap = ld_params.get('ld_cap_period') or ld_params.get('ld_cap_annual')
         if cap and ld_amount > cap:
             logger.info(
                 f"LD amount ${ld_amount:,.2f} exceeds cap ${cap:,.2f} "
@@ -15,6 +15,19 @@ from models.contract import RuleResult
 
 logger = logging.getLogger(__name__)
 
+# Key order of RuleResult.details for capacity factor evaluations
+_DETAILS_TEMPLATE: Dict[str, Any] = dict.fromkeys((
+    'actual_generation_mwh',
+    'expected_generation_mwh',
+    'nameplate_capacity_mw',
+    'total_hours',
+    'excused_hours',
+    'available_hours',
+    'efficiency_factor',
+    'capacity_factor_percent',
+    'threshold_percent',
+), 0.0)
+
 
 class CapacityFactorRule(BaseRule):
     """
@@ -87,14 +100,14 @@ class CapacityFactorRule(BaseRule):
         expected_generation = nameplate_capacity * available_hours * efficiency_factor
 
         # Calculate actual generation (sum of meter readings)
-        if meter_data.empty:
+        if len(meter_data) == 0:
             logger.warning(
                 f"No meter data for capacity factor calculation "
                 f"(clause {self.clause_id})"
             )
             actual_generation = 0.0
         else:
-            actual_generation = meter_data['value'].sum()
+            actual_generation = float(meter_data['value'].sum())
 
         # Calculate capacity factor
         if expected_generation <= 0:
@@ -121,25 +134,29 @@ class CapacityFactorRule(BaseRule):
             )
 
         # Build result
+        capacity_factor_rounded = round(capacity_factor, 2)
+        details = _DETAILS_TEMPLATE.copy()
+        details.update(
+            actual_generation_mwh=round(actual_generation, 2),
+            expected_generation_mwh=round(expected_generation, 2),
+            nameplate_capacity_mw=nameplate_capacity,
+            total_hours=round(total_hours, 2),
+            excused_hours=round(excused_hours, 2),
+            available_hours=round(available_hours, 2),
+            efficiency_factor=efficiency_factor,
+            capacity_factor_percent=capacity_factor_rounded,
+            threshold_percent=threshold,
+        )
+
         result = RuleResult(
             breach=breach,
             rule_type='capacity_factor',
             clause_id=self.clause_id,
-            calculated_value=round(capacity_factor, 2),
+            calculated_value=capacity_factor_rounded,
             threshold_value=threshold,
             shortfall=round(shortfall, 2) if breach else None,
             ld_amount=ld_amount,
-            details={
-                'actual_generation_mwh': round(actual_generation, 2),
-                'expected_generation_mwh': round(expected_generation, 2),
-                'nameplate_capacity_mw': nameplate_capacity,
-                'total_hours': round(total_hours, 2),
-                'excused_hours': round(excused_hours, 2),
-                'available_hours': round(available_hours, 2),
-                'efficiency_factor': efficiency_factor,
-                'capacity_factor_percent': round(capacity_factor, 2),
-                'threshold_percent': threshold,
-            }
+            details=details
         )
 
         logger.info(
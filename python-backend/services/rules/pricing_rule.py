@@ -147,14 +147,15 @@ class PricingRule(BaseRule):
 
     def _calculate_energy_kwh(self, meter_data: pd.DataFrame) -> Decimal:
         """Sum energy production from meter data in kWh."""
-        if meter_data.empty:
+        if len(meter_data) == 0:
             return Decimal('0')
 
-        if 'energy_kwh' in meter_data.columns:
+        columns = meter_data.columns
+        if 'energy_kwh' in columns:
             return Decimal(str(meter_data['energy_kwh'].sum()))
-        elif 'energy_wh' in meter_data.columns:
+        elif 'energy_wh' in columns:
             return Decimal(str(meter_data['energy_wh'].sum() / 1000))
-        elif 'total_production' in meter_data.columns:
+        elif 'total_production' in columns:
             return Decimal(str(meter_data['total_production'].sum()))
         else:
             logger.warning("No energy column found in meter_data for pricing")
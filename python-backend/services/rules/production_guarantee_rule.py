@@ -9,17 +9,28 @@ This rule is for annual evaluation only (operating year boundary).
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional, Dict, Any
+from functools import cached_property
+from typing import Optional, Dict, Any, Tuple
 import logging
 
+import numpy as np
 import pandas as pd
 
-from services.rules.base_rule import BaseRule
+from services.rules.base_rule import BaseRule, meter_column_values
 from models.contract import RuleResult
 
 logger = logging.getLogger(__name__)
 
 
+# Energy columns in order of preference, with the divisor to kWh
+_ENERGY_COLUMNS = (('energy_kwh', 1), ('energy_wh', 1000), ('value', 1))
+
+
+def _column_sum(meter_data: pd.DataFrame, column: str) -> float:
+    """Sum a numeric column on its ndarray, skipping NaN like Series.sum()."""
+    return float(np.nansum(meter_column_values(meter_data, column)))
+
+
 class ProductionGuaranteeRule(BaseRule):
     """
     Evaluates whether actual annual energy production meets the guaranteed output.
@@ -101,9 +112,9 @@ class ProductionGuaranteeRule(BaseRule):
         }
 
         logger.info(
-            f"Production guarantee clause {self.clause_id}: "
-            f"actual={actual_kwh:.0f}kWh, guaranteed={guaranteed_kwh:.0f}kWh, "
-            f"shortfall={shortfall_kwh:.0f}kWh, breach={breach}"
+            "Production guarantee clause %s: "
+            "actual=%.0fkWh, guaranteed=%.0fkWh, shortfall=%.0fkWh, breach=%s",
+            self.clause_id, actual_kwh, guaranteed_kwh, shortfall_kwh, breach
         )
 
         return RuleResult(
@@ -117,30 +128,59 @@ class ProductionGuaranteeRule(BaseRule):
             details=details
         )
 
-    def _get_guaranteed_kwh(self) -> Decimal:
-        """Get guaranteed kWh from params or production_guarantee table."""
-        # Direct from clause payload
+    # Numeric payload keys used by the shortfall payment formulas
+    NUMERIC_PARAM_KEYS = (
+        'p_alternate',
+        'p_solar',
+        'shortfall_rate_per_kwh',
+        'shortfall_cap_usd',
+    )
+
+    @cached_property
+    def param_decimals(self) -> Dict[str, Decimal]:
+        """Numeric shortfall parameters parsed to Decimal once per rule."""
+        return {
+            key: Decimal(str(self.params[key]))
+            for key in self.NUMERIC_PARAM_KEYS
+            if self.params.get(key) is not None
+        }
+
+    @cached_property
+    def guaranteed_kwh(self) -> Decimal:
+        """Guaranteed kWh parsed once from the clause payload."""
         val = self.params.get('guaranteed_annual_production_kwh')
         if val:
             return Decimal(str(val))
         return Decimal('0')
 
+    def _get_guaranteed_kwh(self) -> Decimal:
+        """Get guaranteed kWh from params or production_guarantee table."""
+        return self.guaranteed_kwh
+
+    def _energy_column(self, meter_data: pd.DataFrame) -> Optional[Tuple[str, int]]:
+        """(column, divisor to kWh) of the preferred energy column, or None."""
+        columns = meter_data.columns
+        # Prefer energy_kwh if available, else convert energy_wh
+        return next(
+            ((name, divisor) for name, divisor in _ENERGY_COLUMNS if name in columns),
+            None
+        )
+
     def _calculate_actual_production(self, meter_data: pd.DataFrame) -> Decimal:
         """Sum actual energy production from meter data."""
-        if meter_data.empty:
+        if len(meter_data) == 0:
             return Decimal('0')
 
-        # Prefer energy_kwh if available, else convert energy_wh
-        if 'energy_kwh' in meter_data.columns:
-            total = meter_data['energy_kwh'].sum()
-        elif 'energy_wh' in meter_data.columns:
-            total = meter_data['energy_wh'].sum() / 1000
-        elif 'value' in meter_data.columns:
-            total = meter_data['value'].sum()
-        else:
+        energy_column = self._energy_column(meter_data)
+        if energy_column is None:
             logger.warning("No energy column found in meter_data")
             return Decimal('0')
 
+        column, divisor = energy_column
+        total = _column_sum(meter_data, column)
+        if divisor != 1:
+            total /= divisor
+
         return Decimal(str(total))
 
     def _calculate_excused_energy(self, excused_events: pd.DataFrame) -> Decimal:
@@ -183,14 +223,17 @@ class ProductionGuaranteeRule(BaseRule):
         if formula_type == 'none':
             return Decimal('0.00')
 
+        decimals = self.param_decimals
+        zero = Decimal('0')
+
         if formula_type == 'price_differential':
-            p_alternate = Decimal(str(self.params.get('p_alternate', 0)))
-            p_solar = Decimal(str(self.params.get('p_solar', 0)))
-            price_diff = max(Decimal('0'), p_alternate - p_solar)
+            p_alternate = decimals.get('p_alternate', zero)
+            p_solar = decimals.get('p_solar', zero)
+            price_diff = max(zero, p_alternate - p_solar)
             payment = shortfall_kwh * price_diff
 
         elif formula_type == 'fixed_rate_per_kwh':
-            rate = Decimal(str(self.params.get('shortfall_rate_per_kwh', 0)))
+            rate = decimals.get('shortfall_rate_per_kwh', zero)
             payment = shortfall_kwh * rate
 
         else:
@@ -198,13 +241,11 @@ class ProductionGuaranteeRule(BaseRule):
             return Decimal('0.00')
 
         # Apply annual cap if configured
-        cap = self.params.get('shortfall_cap_usd')
-        if cap:
-            cap_decimal = Decimal(str(cap))
-            if payment > cap_decimal:
-                logger.info(
-                    f"Shortfall payment {payment:.2f} exceeds cap {cap_decimal:.2f}"
-                )
-                payment = cap_decimal
+        cap_decimal = decimals.get('shortfall_cap_usd')
+        if cap_decimal and payment > cap_decimal:
+            logger.info(
+                "Shortfall payment %.2f exceeds cap %.2f", payment, cap_decimal
+            )
+            payment = cap_decimal
 
         return payment.quantize(Decimal('0.01'))
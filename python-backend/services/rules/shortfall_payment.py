@@ -96,11 +96,10 @@ class ShortfallPaymentCalculator:
         }
 
         logger.info(
-            f"Shortfall payment: "
-            f"shortfall={shortfall_kwh:.0f}kWh, "
-            f"P_alt={self.p_alternate:.6f}, P_solar={self.p_solar:.6f}, "
-            f"raw={raw_payment:.2f}, capped={capped_payment:.2f}, "
-            f"cap_applied={cap_applied}"
+            "Shortfall payment: shortfall=%.0fkWh, P_alt=%.6f, P_solar=%.6f, "
+            "raw=%.2f, capped=%.2f, cap_applied=%s",
+            shortfall_kwh, self.p_alternate, self.p_solar,
+            raw_payment, capped_payment, cap_applied
         )
 
         return result
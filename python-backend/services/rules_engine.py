@@ -5,13 +5,16 @@ Evaluates contract clauses against meter data to detect breaches,
 calculate liquidated damages, and generate notifications.
 """
 
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time
 from typing import List, Dict, Any, Optional, Type
 from decimal import Decimal
+import json
 import logging
+import math
 import numpy as np
 
-from services.rules.base_rule import BaseRule
+from services.rules.base_rule import BaseRule, ExcusedHoursCache
 from services.rules.availability_rule import AvailabilityRule
 from services.rules.capacity_factor_rule import CapacityFactorRule
 from services.rules.pricing_rule import PricingRule
@@ -20,36 +23,94 @@ from services.meter_aggregator import MeterAggregator
 from services.event_detector import EventDetector
 from db.rules_repository import RulesRepository
 from db.event_repository import EventRepository
-from db.ontology_repository import OntologyRepository
+from db.ontology_repository import OntologyRepository, PrefetchedOntologyRepository
 from models.contract import RuleResult, RuleEvaluationResult
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+_NATIVE_LEAF_TYPES = frozenset({str, int, bool, type(None)})
+_NP_SCALAR_TYPES = (np.integer, np.floating, np.bool_)
+
+
+def _json_key(key) -> str:
+    """Stringify a non-str dict key the way orjson's OPT_NON_STR_KEYS does."""
+    if isinstance(key, str):
+        return key
+    if key is None:
+        return 'null'
+    if isinstance(key, (bool, np.bool_)):
+        return 'true' if key else 'false'
+    if isinstance(key, (datetime, date, time)):
+        return key.isoformat()
+    if isinstance(key, _NP_SCALAR_TYPES):
+        return str(key.item())
+    return str(key)
+
 
 def convert_numpy_types(obj):
     """
     Convert numpy/pandas types to native Python types for JSON serialization.
 
+    The result has the shape a JSON round trip would give: datetimes become
+    ISO strings, NaN/inf become None, tuples become lists and dict keys are
+    stringified.
+
     Args:
         obj: Object that may contain numpy types
 
     Returns:
         Object with all numpy types converted to native Python types
     """
-    if isinstance(obj, dict):
-        return {key: convert_numpy_types(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
+    obj_type = type(obj)
+    if obj_type is dict:
+        return {_json_key(key): convert_numpy_types(value) for key, value in obj.items()}
+    if obj_type is list:
         return [convert_numpy_types(item) for item in obj]
-    elif isinstance(obj, (np.integer, np.int64, np.int32)):
-        return int(obj)
-    elif isinstance(obj, (np.floating, np.float64, np.float32)):
-        return float(obj)
-    elif isinstance(obj, np.bool_):
-        return bool(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    else:
+    if obj_type in _NATIVE_LEAF_TYPES:
         return obj
+    if obj_type is float:
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, _NP_SCALAR_TYPES):
+        return convert_numpy_types(obj.item())
+    if isinstance(obj, np.ndarray):
+        return convert_numpy_types(obj.tolist())
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    # Subclasses (e.g. RealDictRow) take the slower isinstance path
+    if isinstance(obj, dict):
+        return {_json_key(key): convert_numpy_types(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [convert_numpy_types(item) for item in obj]
+    if isinstance(obj, float):
+        return float(obj) if math.isfinite(obj) else None
+    return obj
+
+
+def to_json_native(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a JSONB payload to native Python types in one pass.
+
+    Uses orjson (numpy scalars/arrays handled in C) when installed and falls
+    back to the recursive convert_numpy_types walk otherwise, or when the
+    payload holds values orjson cannot encode (e.g. Decimal). Both paths
+    return the same shape.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return json.loads(orjson.dumps(
+                payload,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            ))
+        except TypeError:
+            pass
+    return convert_numpy_types(payload)
 
 
 class RulesEngine:
@@ -82,6 +143,9 @@ class RulesEngine:
         'PRODUCTION_GUARANTEE': ProductionGuaranteeRule,
     }
 
+    # Upper bound on threads used to evaluate clauses of one contract
+    MAX_EVALUATION_WORKERS = 8
+
     def __init__(
         self,
         meter_aggregator: Optional[MeterAggregator] = None,
@@ -102,7 +166,11 @@ class RulesEngine:
         """
         self.meter_aggregator = meter_aggregator or MeterAggregator()
         self.repository = repository or RulesRepository()
-        self.event_detector = event_detector or EventDetector()
+        # Share the aggregator so event detection and rule evaluation of the
+        # same period hit the database once
+        self.event_detector = event_detector or EventDetector(
+            meter_aggregator=self.meter_aggregator
+        )
         self.event_repository = event_repository or EventRepository()
         self.ontology_repo = ontology_repo or OntologyRepository()
 
@@ -137,6 +205,20 @@ class RulesEngine:
             # Step 1: Load clauses
             clauses = self.repository.get_evaluable_clauses(contract_id)
 
+            # Only clauses with a registered rule class can be evaluated;
+            # drop the rest here instead of skipping them one by one in Step 5
+            rule_clauses = [
+                c for c in clauses
+                if c.get('clause_category_code') in self.RULE_CLASSES
+            ]
+            skipped_count = len(clauses) - len(rule_clauses)
+            if skipped_count:
+                processing_notes.append(
+                    f"Skipped {skipped_count} clauses with no rule class"
+                )
+                logger.info(processing_notes[-1])
+            clauses = rule_clauses
+
             if not clauses:
                 processing_notes.append(
                     f"No evaluable clauses found for contract {contract_id}"
@@ -183,20 +265,20 @@ class RulesEngine:
                     period_end=period_end
                 )
 
-                # Store detected events in database
-                for detected in detected_events:
-                    event_id = self.event_repository.create_event(
-                        project_id=project_id,
-                        event_type_id=detected.event_type_id,
-                        time_start=detected.time_start,
-                        time_end=detected.time_end,
-                        raw_data=detected.raw_data,
-                        description=detected.description,
-                        metric_outcome=detected.metric_outcome,
-                        status='open'
-                    )
-                    if event_id:
-                        event_ids.append(event_id)
+                # Store detected events in database (single bulk insert)
+                event_ids = self.event_repository.create_events_bulk([
+                    {
+                        'project_id': project_id,
+                        'event_type_id': detected.event_type_id,
+                        'time_start': detected.time_start,
+                        'time_end': detected.time_end,
+                        'raw_data': detected.raw_data,
+                        'description': detected.description,
+                        'metric_outcome': detected.metric_outcome,
+                        'status': 'open',
+                    }
+                    for detected in detected_events
+                ])
 
                 processing_notes.append(
                     f"Detected and stored {len(event_ids)} operational events"
@@ -207,13 +289,15 @@ class RulesEngine:
                 logger.error(f"Event detection failed: {e}", exc_info=True)
                 processing_notes.append(f"WARNING: Event detection failed: {e}")
 
-            # Step 3: Load meter data (once for all clauses)
+            # Step 3: Load meter data (once for all clauses), selecting only
+            # the columns the rules for these clauses read
             # TODO: Support multiple meter types (currently assumes 'PRODUCTION')
             meter_data = self.meter_aggregator.load_meter_readings(
                 project_id=project_id,
                 meter_type='PRODUCTION',
                 period_start=period_start,
-                period_end=period_end
+                period_end=period_end,
+                columns=self._required_meter_columns(clauses)
             )
 
             # Validate data completeness
@@ -241,39 +325,66 @@ class RulesEngine:
             )
 
             # Step 5: Evaluate each clause
-            for clause in clauses:
-                try:
-                    result = self._evaluate_clause(
-                        clause, meter_data, period_start, period_end, excused_events
-                    )
-
-                    if result:
+            # Load EXCUSES relationships for the whole contract once instead
+            # of one query per clause
+            ontology_repo = self._prefetch_ontology(contract_id)
+
+            # Excused hours depend only on (excuse types, period), so clauses
+            # with the same excuse configuration share one computation
+            excused_hours_cache = ExcusedHoursCache()
+
+            # Resolve every clause's rule class up front, then evaluate the
+            # clauses in parallel (rules only read the shared DataFrames).
+            # Futures are submitted and collected in clause order, so results
+            # and stored breaches follow get_evaluable_clauses order.
+            evaluations = list(zip(clauses, self._resolve_rule_classes(clauses)))
+            max_workers = min(self.MAX_EVALUATION_WORKERS, len(evaluations))
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    (clause, executor.submit(
+                        self._evaluate_clause,
+                        clause, meter_data, period_start, period_end, excused_events,
+                        ontology_repo=ontology_repo,
+                        rule_class=rule_class,
+                        excused_hours_cache=excused_hours_cache
+                    ))
+                    for clause, rule_class in evaluations
+                ]
+
+                for clause, future in futures:
+                    try:
+                        result = future.result()
                         default_events.append(result)
 
                         if result.breach and result.ld_amount:
                             ld_total += result.ld_amount
 
-                except Exception as e:
-                    logger.error(
-                        f"Failed to evaluate clause {clause['id']}: {e}",
-                        exc_info=True
-                    )
-                    processing_notes.append(
-                        f"ERROR evaluating clause {clause['id']} '{clause['name']}': {e}"
-                    )
+                    except Exception as e:
+                        logger.error(
+                            f"Failed to evaluate clause {clause['id']}: {e}",
+                            exc_info=True
+                        )
+                        processing_notes.append(
+                            f"ERROR evaluating clause {clause['id']} '{clause['name']}': {e}"
+                        )
 
             # Step 6: Store results and generate notifications for breaches
             # Link breaches to most severe operational event (if any)
             primary_event_id = event_ids[0] if event_ids else None
 
+            # Period bounds are the same for every breach record
+            ps_iso = period_start.isoformat()
+            pe_iso = period_end.isoformat()
+
+            breach_records = []
             for result in default_events:
                 if result.breach:
                     try:
-                        self._store_breach(
+                        breach_records.append(self._build_breach_records(
                             result, contract_id, project_id, period_start, period_end,
-                            event_id=primary_event_id
-                        )
-                        notifications_generated += 1
+                            event_id=primary_event_id, ps_iso=ps_iso, pe_iso=pe_iso
+                        ))
                     except Exception as e:
                         logger.error(
                             f"Failed to store breach for clause {result.clause_id}: {e}",
@@ -283,6 +394,22 @@ class RulesEngine:
                             f"ERROR storing breach for clause {result.clause_id}: {e}"
                         )
 
+            if breach_records:
+                try:
+                    stored = self.repository.store_breaches_bulk(breach_records)
+                    notifications_generated += len(stored)
+                except Exception as e:
+                    # The batch is one transaction, so none of these were stored
+                    failed_clause_ids = [r['rule_output']['clause_id'] for r in breach_records]
+                    logger.error(
+                        f"Failed to store breaches for clauses {failed_clause_ids} "
+                        f"(contract {contract_id}): {e}",
+                        exc_info=True
+                    )
+                    processing_notes.append(
+                        f"ERROR storing breaches for clauses {failed_clause_ids}: {e}"
+                    )
+
             # Summary
             breach_count = sum(1 for r in default_events if r.breach)
             processing_notes.append(
@@ -317,14 +444,59 @@ class RulesEngine:
                 processing_notes=processing_notes
             )
 
+    def _required_meter_columns(self, clauses: List[Dict[str, Any]]) -> List[str]:
+        """
+        Union of REQUIRED_COLUMNS for the rule classes used by the clauses.
+
+        reading_timestamp is always included for the completeness check.
+        """
+        needed = {'reading_timestamp'}
+        for rule_class in set(self._resolve_rule_classes(clauses)):
+            needed.update(rule_class.REQUIRED_COLUMNS)
+        return sorted(needed)
+
+    def _prefetch_ontology(self, contract_id: int):
+        """
+        Wrap the ontology repository with contract-wide EXCUSES preloaded.
+
+        Falls back to the plain repository (per-clause queries) if the
+        bulk load fails.
+        """
+        try:
+            return PrefetchedOntologyRepository(self.ontology_repo, contract_id)
+        except Exception as e:
+            logger.warning(
+                f"Could not prefetch EXCUSES relationships for contract "
+                f"{contract_id}: {e}"
+            )
+            return self.ontology_repo
+
+    def _resolve_rule_classes(
+        self,
+        clauses: List[Dict[str, Any]]
+    ) -> List[Type[BaseRule]]:
+        """
+        Rule class for each clause, in input order.
+
+        Every clause must have a registered rule class (evaluate_period
+        filters the rest out first).
+
+        Raises:
+            KeyError: If a clause category has no registered rule class
+        """
+        return [self.RULE_CLASSES[clause['clause_category_code']] for clause in clauses]
+
     def _evaluate_clause(
         self,
         clause: Dict[str, Any],
         meter_data,
         period_start: datetime,
         period_end: datetime,
-        excused_events
-    ) -> Optional[RuleResult]:
+        excused_events,
+        ontology_repo=None,
+        rule_class: Optional[Type[BaseRule]] = None,
+        excused_hours_cache: Optional[ExcusedHoursCache] = None
+    ) -> RuleResult:
         """
         Evaluate a single clause using appropriate rule class.
 
@@ -334,46 +506,50 @@ class RulesEngine:
             period_start: Period start
             period_end: Period end
             excused_events: DataFrame from meter_aggregator
+            ontology_repo: Optional ontology repository override
+                (defaults to self.ontology_repo)
+            rule_class: Optional pre-resolved rule class (skips the
+                RULE_CLASSES lookup)
+            excused_hours_cache: Optional cache shared by the clauses of
+                one evaluation
 
         Returns:
-            RuleResult or None if clause not evaluable
-        """
-        # Determine rule class from clause category
-        clause_category_code = clause.get('clause_category_code')
-
-        if not clause_category_code:
-            logger.warning(
-                f"Clause {clause['id']} missing clause_category_code - skipping"
-            )
-            return None
-
-        # Get rule class
-        rule_class = self.RULE_CLASSES.get(clause_category_code)
+            RuleResult
 
-        if not rule_class:
-            logger.debug(
-                f"No rule class for clause_category '{clause_category_code}' - "
-                f"skipping clause {clause['id']}"
-            )
-            return None
+        Raises:
+            KeyError: If no rule class is registered for the clause category
+                (evaluate_period only passes clauses that have one)
+        """
+        if rule_class is None:
+            rule_class = self.RULE_CLASSES[clause['clause_category_code']]
 
         # Instantiate with ontology_repo for relationship-based excuse detection
-        rule = rule_class(clause, ontology_repo=self.ontology_repo)
+        rule = rule_class(
+            clause,
+            ontology_repo=ontology_repo or self.ontology_repo,
+            excused_hours_cache=excused_hours_cache
+        )
         result = rule.evaluate(meter_data, period_start, period_end, excused_events)
 
+        # Rules cast their outputs to native types; normalize details once at
+        # this boundary so breach payloads can be stored without another walk
+        result.details = to_json_native(result.details)
+
         return result
 
-    def _store_breach(
+    def _build_breach_records(
         self,
         result: RuleResult,
         contract_id: int,
         project_id: int,
         period_start: datetime,
         period_end: datetime,
-        event_id: Optional[int] = None
-    ) -> None:
+        event_id: Optional[int] = None,
+        ps_iso: Optional[str] = None,
+        pe_iso: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
         """
-        Store a breach in database (default_event + rule_output).
+        Build the default_event, rule_output and notification rows for a breach.
 
         Args:
             result: RuleResult with breach=True
@@ -382,7 +558,18 @@ class RulesEngine:
             period_start: When the breach occurred
             period_end: When the breach period ended
             event_id: Optional FK to event table (operational incident that caused breach)
+            ps_iso: period_start.isoformat(), precomputed by callers building
+                many records for the same period
+            pe_iso: period_end.isoformat(), likewise
+
+        Returns:
+            Dict in the shape expected by RulesRepository.store_breaches_bulk()
         """
+        if ps_iso is None:
+            ps_iso = period_start.isoformat()
+        if pe_iso is None:
+            pe_iso = period_end.isoformat()
+
         # Determine severity based on shortfall
         if result.shortfall and result.threshold_value:
             shortfall_pct = (result.shortfall / result.threshold_value) * 100
@@ -411,9 +598,8 @@ class RulesEngine:
         else:
             description = f"{result.rule_type} breach detected"
 
-        # Create default_event
-        # Convert numpy types to native Python types for JSON serialization
-        metadata_detail = convert_numpy_types({
+        # Values are native Python types already (see _evaluate_clause)
+        metadata_detail = {
             'rule_type': result.rule_type,
             'clause_id': result.clause_id,
             'breach': True,
@@ -421,42 +607,12 @@ class RulesEngine:
             'threshold_value': result.threshold_value,
             'shortfall': result.shortfall,
             'details': result.details,
-            'period_start': period_start.isoformat(),
-            'period_end': period_end.isoformat(),
-        })
-
-        default_event_id = self.repository.create_default_event(
-            project_id=project_id,
-            contract_id=contract_id,
-            time_start=period_start,
-            status='open',
-            metadata_detail=metadata_detail,
-            description=description,
-            event_id=event_id
-        )
-
-        if not default_event_id:
-            raise Exception("Failed to create default_event")
-
-        # Create rule_output
-        rule_output_id = self.repository.create_rule_output(
-            default_event_id=default_event_id,
-            project_id=project_id,
-            clause_id=result.clause_id,
-            rule_type=result.rule_type,
-            calculated_value=result.calculated_value,
-            threshold_value=result.threshold_value,
-            shortfall=result.shortfall,
-            ld_amount=result.ld_amount,
-            output_detail=result.details
-        )
-
-        if not rule_output_id:
-            raise Exception("Failed to create rule_output")
+            'period_start': ps_iso,
+            'period_end': pe_iso,
+        }
 
-        # Generate notification
         notification_description = f"{result.rule_type.title()} breach: {result.calculated_value:.2f}% (threshold: {result.threshold_value}%)"
-        notification_metadata = convert_numpy_types({
+        notification_metadata = {
             'breach_type': result.rule_type,
             'clause_id': result.clause_id,
             'contract_id': contract_id,
@@ -464,23 +620,34 @@ class RulesEngine:
             'threshold_value': result.threshold_value,
             'shortfall': result.shortfall,
             'ld_amount': float(result.ld_amount) if result.ld_amount else None,
-            'period_start': period_start.isoformat(),
-            'period_end': period_end.isoformat(),
+            'period_start': ps_iso,
+            'period_end': pe_iso,
             'severity': severity
-        })
-
-        notification_id = self.repository.create_notification(
-            project_id=project_id,
-            default_event_id=default_event_id,
-            rule_output_id=rule_output_id,
-            description=notification_description,
-            metadata_detail=notification_metadata
-        )
-
-        if not notification_id:
-            raise Exception("Failed to create notification")
-
-        logger.info(
-            f"Stored breach: default_event={default_event_id}, "
-            f"rule_output={rule_output_id}, notification={notification_id}"
-        )
+        }
+
+        return {
+            'default_event': {
+                'project_id': project_id,
+                'contract_id': contract_id,
+                'time_start': period_start,
+                'status': 'open',
+                'metadata_detail': metadata_detail,
+                'description': description,
+                'event_id': event_id,
+            },
+            'rule_output': {
+                'project_id': project_id,
+                'clause_id': result.clause_id,
+                'rule_type': result.rule_type,
+                'calculated_value': result.calculated_value,
+                'threshold_value': result.threshold_value,
+                'shortfall': result.shortfall,
+                'ld_amount': result.ld_amount,
+                'output_detail': result.details,
+            },
+            'notification': {
+                'project_id': project_id,
+                'description': notification_description,
+                'metadata_detail': notification_metadata,
+            },
+        }
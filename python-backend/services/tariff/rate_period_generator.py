@@ -9,18 +9,39 @@ Non-deterministic types (US_CPI, REBASED_MARKET_PRICE) are skipped — they
 require external data feeds.
 """
 
+import bisect
+import calendar
+import csv
+import io
 import json
 import logging
 from datetime import date, timedelta
 from decimal import Decimal, ROUND_HALF_UP
 from typing import Any, Dict, List
 
+from psycopg2.extras import execute_values
+
 from db.database import get_db_connection
 
 logger = logging.getLogger(__name__)
 
 DETERMINISTIC_CODES = frozenset({"NONE", "FIXED_INCREASE", "FIXED_DECREASE", "PERCENTAGE"})
 
+# From this many new period rows, load through COPY into a staging table
+# instead of a multi-row INSERT
+COPY_THRESHOLD_ROWS = 5000
+
+# Per-row columns of the Year 2..N insert rows built by _process_tariff
+_INSERT_ROW_COLUMNS = (
+    "clause_tariff_id", "operating_year",
+    "period_start", "period_end",
+    "hard_currency_id", "local_currency_id", "billing_currency_id",
+    "effective_rate_contract_ccy", "effective_rate_hard_ccy",
+    "effective_rate_local_ccy", "effective_rate_billing_ccy",
+    "calc_detail",
+    "calculation_basis", "is_current",
+)
+
 
 class RatePeriodGenerator:
     """Generate tariff_rate rows for deterministic escalation types."""
@@ -30,56 +51,77 @@ class RatePeriodGenerator:
         Main entry point.  For each current clause_tariff with a deterministic
         escalation type, compute Years 2..N and batch INSERT.
 
+        All tariffs of the project are computed in Python first, then written
+        with a fixed number of statements (see _write_tariff_rows).
+
         Returns {"tariffs_processed": M, "periods_generated": N}.
         """
-        tariffs = self._fetch_tariffs(project_id)
-        if not tariffs:
-            logger.info(f"No deterministic tariffs found for project {project_id}")
-            return {"tariffs_processed": 0, "periods_generated": 0}
-
-        total_periods = 0
+        # One "today" for the whole run, so every tariff agrees on is_current
+        today = date.today()
 
         with get_db_connection() as conn:
             conn.autocommit = False
             try:
+                plans = [
+                    self._process_tariff(t, today)
+                    for t in self._fetch_tariffs(project_id, conn=conn)
+                ]
+                if not plans:
+                    logger.info(f"No deterministic tariffs found for project {project_id}")
+                    return {"tariffs_processed": 0, "periods_generated": 0}
+
                 with conn.cursor() as cur:
-                    for t in tariffs:
-                        n = self._process_tariff(cur, t)
-                        total_periods += n
+                    total_periods = self._write_tariff_rows(cur, plans)
                 conn.commit()
             except Exception:
                 conn.rollback()
                 raise
 
         logger.info(
-            f"Rate period generation complete: {len(tariffs)} tariffs, "
+            f"Rate period generation complete: {len(plans)} tariffs, "
             f"{total_periods} periods generated for project {project_id}"
         )
-        return {"tariffs_processed": len(tariffs), "periods_generated": total_periods}
+        return {"tariffs_processed": len(plans), "periods_generated": total_periods}
 
-    def _fetch_tariffs(self, project_id: int) -> List[Dict[str, Any]]:
-        """Fetch clause_tariff rows with deterministic escalation types."""
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    SELECT ct.id, ct.base_rate, ct.valid_from, ct.currency_id,
-                           ct.logic_parameters, esc.code AS escalation_type_code,
-                           c.contract_term_years
-                    FROM clause_tariff ct
-                    JOIN contract c ON ct.contract_id = c.id
-                    JOIN escalation_type esc ON esc.id = ct.escalation_type_id
-                    WHERE ct.project_id = %s
-                      AND ct.is_current = true
-                      AND ct.base_rate IS NOT NULL
-                      AND esc.code IN ('NONE', 'FIXED_INCREASE', 'FIXED_DECREASE', 'PERCENTAGE')
-                    """,
-                    (project_id,),
-                )
-                return [dict(row) for row in cur.fetchall()]
-
-    def _process_tariff(self, cur, tariff: Dict[str, Any]) -> int:
-        """Compute and insert rate periods for a single tariff. Returns count of new rows."""
+    def _fetch_tariffs(self, project_id: int, conn=None) -> List[Dict[str, Any]]:
+        """
+        Fetch clause_tariff rows with deterministic escalation types.
+
+        Reads on the caller's connection (and transaction) when one is given,
+        otherwise opens its own.
+        """
+        if conn is None:
+            with get_db_connection() as own_conn:
+                return self._fetch_tariffs(project_id, conn=own_conn)
+
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT ct.id, ct.base_rate, ct.valid_from, ct.currency_id,
+                       ct.logic_parameters, esc.code AS escalation_type_code,
+                       c.contract_term_years
+                FROM clause_tariff ct
+                JOIN contract c ON ct.contract_id = c.id
+                JOIN escalation_type esc ON esc.id = ct.escalation_type_id
+                WHERE ct.project_id = %s
+                  AND ct.is_current = true
+                  AND ct.base_rate IS NOT NULL
+                  AND esc.code IN ('NONE', 'FIXED_INCREASE', 'FIXED_DECREASE', 'PERCENTAGE')
+                """,
+                (project_id,),
+            )
+            # Rows are RealDictRow (a dict subclass) from the pool's cursor
+            # factory, so they are returned without copying
+            return cur.fetchall()
+
+    def _process_tariff(self, tariff: Dict[str, Any], today: date) -> Dict[str, Any]:
+        """
+        Compute rate periods for a single tariff, flagging the period that
+        contains today.
+
+        Returns a dict with the clause_tariff id, the Year 1 update values,
+        the Year 2..N insert rows and the operating year containing today.
+        """
         ct_id = tariff["id"]
         base_rate = Decimal(str(tariff["base_rate"]))
         valid_from = tariff["valid_from"]
@@ -95,49 +137,43 @@ class RatePeriodGenerator:
         if hasattr(valid_from, "date"):
             valid_from = valid_from.date()
 
-        today = date.today()
-
-        # Build list of (year, period_start, period_end, effective_tariff, basis)
-        periods: List[tuple] = []
-
-        for year in range(1, term_years + 1):
-            # --- period_start ---
-            if year == 1:
-                p_start = valid_from
-            elif year == 2 and escalation_start_date_str:
-                p_start = date.fromisoformat(str(escalation_start_date_str))
-            else:
-                # Derive from escalation_start_date for year 2+ if available
-                if escalation_start_date_str:
-                    esc_start = date.fromisoformat(str(escalation_start_date_str))
-                    p_start = _add_years(esc_start, year - 2)
-                else:
-                    p_start = _add_years(valid_from, year - 1)
-
-            # --- effective_tariff ---
-            rate, basis = _compute_rate(esc_code, base_rate, escalation_value, year)
-
-            periods.append((year, p_start, rate, basis))
-
-        # --- period_end: each year ends the day before the next starts; last year is NULL ---
-        period_rows = []
-        for i, (year, p_start, rate, basis) in enumerate(periods):
-            if i + 1 < len(periods):
-                p_end = periods[i + 1][1] - timedelta(days=1)
-            else:
-                p_end = None
-            period_rows.append((year, p_start, p_end, rate, basis))
-
-        # --- is_current: only the period containing today ---
-        current_year = None
-        for year, p_start, p_end, rate, basis in period_rows:
-            if p_start <= today and (p_end is None or today <= p_end):
-                current_year = year
-                break
-
-        # --- Update Year 1 row (already exists): set period_end and is_current ---
+        # Effective tariff for every year at once
+        rates = _compute_rates(esc_code, base_rate, escalation_value, term_years)
+
+        # --- period_start: Year 1 from valid_from; Year 2+ anniversaries of
+        # escalation_start_date if available, else of valid_from ---
+        if escalation_start_date_str:
+            esc_start = date.fromisoformat(str(escalation_start_date_str))
+            starts = [valid_from] + [_add_years(esc_start, n) for n in range(term_years - 1)]
+        else:
+            starts = [_add_years(valid_from, n) for n in range(term_years)]
+
+        # Build list of (year, period_start, period_end, effective_tariff);
+        # each year ends the day before the next starts, last year is NULL
+        period_rows: List[tuple] = [
+            (
+                year,
+                starts[year - 1],
+                starts[year] - timedelta(days=1) if year < term_years else None,
+                rate,
+            )
+            for year, rate in zip(range(1, term_years + 1), rates)
+        ]
+
+        # --- is_current: only the period containing today. Year 2+ starts
+        # are ascending anniversaries, so bisect them; Year 1 runs from
+        # valid_from until the Year 2 start ---
+        if term_years > 1 and today >= starts[1]:
+            current_year = bisect.bisect_right(starts, today, lo=1)
+        elif starts[0] <= today:
+            current_year = 1
+        else:
+            current_year = None
+
+        # --- Year 1 row (already exists): period_end, is_current and rate ---
         year1_end = period_rows[0][2] if period_rows else None
         year1_is_current = (current_year == 1)
+        year1_rate = period_rows[0][3] if period_rows else base_rate
 
         # For deterministic tariffs: same-currency, all 3 FKs = currency_id,
         # all 4 effective_rate columns = same value.
@@ -147,46 +183,95 @@ class RatePeriodGenerator:
             "escalation_value": float(escalation_value),
         }
 
-        # Clear is_current on existing annual tariff_rate rows
+        insert_rows = [
+            (
+                ct_id, year,
+                p_start, p_end,
+                currency_id, currency_id, currency_id,  # same-currency: all 3 = same
+                rate, rate, rate, rate,                  # all 4 columns = same value
+                json.dumps({**calc_detail_base, "years_elapsed": year - 1}),
+                _format_basis(esc_code, base_rate, escalation_value, year),
+                year == current_year,
+            )
+            for year, p_start, p_end, rate in period_rows
+            if year != 1
+        ]
+
+        return {
+            "ct_id": ct_id,
+            "year1": (ct_id, year1_end, year1_is_current, year1_rate),
+            "insert_rows": insert_rows,
+            "current_year": current_year,
+        }
+
+    def _write_tariff_rows(self, cur, plans: List[Dict[str, Any]]) -> int:
+        """
+        Write the computed periods of all tariffs. Returns count of new rows.
+
+        A fixed number of statements regardless of tariff count: read the
+        current flags, clear is_current, update Year 1 rows, insert Years
+        2..N, then set is_current on the current operating year where it is
+        past Year 1. Tariffs whose current year is unchanged skip the clear
+        and the final update.
+        """
+        # Annual rows currently flagged is_current, per tariff
         cur.execute(
             """
-            UPDATE tariff_rate SET is_current = false
-            WHERE clause_tariff_id = %s AND rate_granularity = 'annual' AND is_current = true
+            SELECT clause_tariff_id, operating_year FROM tariff_rate
+            WHERE clause_tariff_id = ANY(%s) AND rate_granularity = 'annual' AND is_current = true
             """,
-            (ct_id,),
+            ([plan["ct_id"] for plan in plans],),
         )
+        flagged_years: Dict[int, set] = {}
+        for row in cur.fetchall():
+            flagged_years.setdefault(row["clause_tariff_id"], set()).add(row["operating_year"])
+
+        changed_plans = [
+            plan for plan in plans
+            if flagged_years.get(plan["ct_id"], set())
+            != ({plan["current_year"]} if plan["current_year"] else set())
+        ]
+
+        # Clear is_current on existing annual tariff_rate rows
+        if changed_plans:
+            cur.execute(
+                """
+                UPDATE tariff_rate SET is_current = false
+                WHERE clause_tariff_id = ANY(%s) AND rate_granularity = 'annual' AND is_current = true
+                """,
+                ([plan["ct_id"] for plan in changed_plans],),
+            )
 
         # Update Year 1 in tariff_rate
-        year1_rate = period_rows[0][3] if period_rows else base_rate
-        year1_basis = period_rows[0][4] if period_rows else "Year 1: original contractual base rate"
-        cur.execute(
+        execute_values(
+            cur,
             """
-            UPDATE tariff_rate
-            SET period_end = %s, is_current = %s,
-                effective_rate_contract_ccy = %s,
-                effective_rate_hard_ccy = %s,
-                effective_rate_local_ccy = %s,
-                effective_rate_billing_ccy = %s,
+            UPDATE tariff_rate t
+            SET period_end = v.period_end, is_current = v.is_current,
+                effective_rate_contract_ccy = v.rate,
+                effective_rate_hard_ccy = v.rate,
+                effective_rate_local_ccy = v.rate,
+                effective_rate_billing_ccy = v.rate,
                 calc_status = 'computed',
                 updated_at = NOW()
-            WHERE clause_tariff_id = %s AND operating_year = 1 AND rate_granularity = 'annual'
+            FROM (VALUES %s) AS v(clause_tariff_id, period_end, is_current, rate)
+            WHERE t.clause_tariff_id = v.clause_tariff_id
+              AND t.operating_year = 1 AND t.rate_granularity = 'annual'
             """,
-            (year1_end, year1_is_current,
-             year1_rate, year1_rate, year1_rate, year1_rate,
-             ct_id),
+            [plan["year1"] for plan in plans],
+            template="(%s, %s::date, %s::boolean, %s::numeric)",
+            page_size=500,
         )
 
         # Insert Years 2..N into tariff_rate
+        insert_rows = [row for plan in plans for row in plan["insert_rows"]]
         inserted = 0
-        for year, p_start, p_end, rate, basis in period_rows:
-            if year == 1:
-                continue
-            is_current = (year == current_year)
-            calc_detail = json.dumps({
-                **calc_detail_base,
-                "years_elapsed": year - 1,
-            })
-            cur.execute(
+        if len(insert_rows) >= COPY_THRESHOLD_ROWS:
+            inserted = self._copy_insert_rows(cur, insert_rows)
+        elif insert_rows:
+            # RETURNING only yields rows that were not skipped by ON CONFLICT
+            returned = execute_values(
+                cur,
                 """
                 INSERT INTO tariff_rate (
                     clause_tariff_id, operating_year, rate_granularity,
@@ -198,81 +283,165 @@ class RatePeriodGenerator:
                     calc_detail,
                     rate_binding, formula_version,
                     calc_status, calculation_basis, is_current
-                ) VALUES (
-                    %s, %s, 'annual',
-                    %s, %s,
-                    %s, %s, %s,
-                    %s, %s, %s, %s,
-                    'hard',
-                    %s::jsonb,
-                    'fixed', 'deterministic_v1',
-                    'computed', %s, %s
-                )
+                ) VALUES %s
                 ON CONFLICT (clause_tariff_id, operating_year)
                     WHERE rate_granularity = 'annual'
                 DO NOTHING
+                RETURNING id
                 """,
-                (
-                    ct_id, year,
-                    p_start, p_end,
-                    currency_id, currency_id, currency_id,  # same-currency: all 3 = same
-                    rate, rate, rate, rate,                  # all 4 columns = same value
-                    calc_detail,
-                    basis, is_current,
+                insert_rows,
+                template=(
+                    "(%s, %s, 'annual', %s, %s, %s, %s, %s, %s, %s, %s, %s, "
+                    "'hard', %s::jsonb, 'fixed', 'deterministic_v1', 'computed', %s, %s)"
                 ),
+                page_size=500,
+                fetch=True,
             )
-            inserted += cur.rowcount
+            inserted = len(returned)
 
         # Set correct is_current in tariff_rate
-        if current_year and current_year > 1:
-            cur.execute(
+        current_rows = [
+            (plan["ct_id"], plan["current_year"])
+            for plan in changed_plans
+            if plan["current_year"] and plan["current_year"] > 1
+        ]
+        if current_rows:
+            execute_values(
+                cur,
                 """
-                UPDATE tariff_rate
+                UPDATE tariff_rate t
                 SET is_current = true
-                WHERE clause_tariff_id = %s AND operating_year = %s AND rate_granularity = 'annual'
+                FROM (VALUES %s) AS v(clause_tariff_id, operating_year)
+                WHERE t.clause_tariff_id = v.clause_tariff_id
+                  AND t.operating_year = v.operating_year
+                  AND t.rate_granularity = 'annual'
                 """,
-                (ct_id, current_year),
+                current_rows,
+                page_size=500,
             )
 
         return inserted
 
+    def _copy_insert_rows(self, cur, insert_rows: List[tuple]) -> int:
+        """
+        Bulk-load Year 2..N rows via COPY. Returns count of new rows.
 
-def _compute_rate(
+        COPY has no ON CONFLICT, so rows go into a transaction-scoped staging
+        table first and are moved with INSERT ... SELECT ... DO NOTHING.
+        """
+        columns = ", ".join(_INSERT_ROW_COLUMNS)
+        cur.execute(
+            f"""
+            CREATE TEMP TABLE stg_tariff_rate ON COMMIT DROP AS
+            SELECT {columns} FROM tariff_rate WITH NO DATA
+            """
+        )
+
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for row in insert_rows:
+            # None -> empty unquoted field, which COPY CSV reads as NULL
+            writer.writerow(["" if v is None else v for v in row])
+        buf.seek(0)
+        cur.copy_expert(f"COPY stg_tariff_rate ({columns}) FROM STDIN WITH (FORMAT csv)", buf)
+
+        cur.execute(
+            """
+            INSERT INTO tariff_rate (
+                clause_tariff_id, operating_year, rate_granularity,
+                period_start, period_end,
+                hard_currency_id, local_currency_id, billing_currency_id,
+                effective_rate_contract_ccy, effective_rate_hard_ccy,
+                effective_rate_local_ccy, effective_rate_billing_ccy,
+                effective_rate_contract_role,
+                calc_detail,
+                rate_binding, formula_version,
+                calc_status, calculation_basis, is_current
+            )
+            SELECT
+                clause_tariff_id, operating_year, 'annual',
+                period_start, period_end,
+                hard_currency_id, local_currency_id, billing_currency_id,
+                effective_rate_contract_ccy, effective_rate_hard_ccy,
+                effective_rate_local_ccy, effective_rate_billing_ccy,
+                'hard',
+                calc_detail,
+                'fixed', 'deterministic_v1',
+                'computed', calculation_basis, is_current
+            FROM stg_tariff_rate
+            ON CONFLICT (clause_tariff_id, operating_year)
+                WHERE rate_granularity = 'annual'
+            DO NOTHING
+            """
+        )
+        inserted = cur.rowcount
+        cur.execute("DROP TABLE stg_tariff_rate")
+        return inserted
+
+
+# calculation_basis text per escalation type; formatted only for the rows
+# that are inserted (Year 1 already exists and keeps its basis)
+_BASIS_TEMPLATES = {
+    "NONE": "Year {year}: flat rate (no escalation)",
+    "FIXED_INCREASE": "Year {year}: {base} + {esc} x {years}",
+    "FIXED_DECREASE": "Year {year}: max(0, {base} - {esc} x {years})",
+    "PERCENTAGE": "Year {year}: {base} x (1 + {esc})^{years}",
+}
+_UNKNOWN_BASIS_TEMPLATE = "Year {year}: unknown escalation type {code}"
+
+
+def _format_basis(esc_code: str, base_rate: Decimal, escalation_value: Decimal, year: int) -> str:
+    """Return the calculation_basis text for a Year 2+ rate."""
+    return _BASIS_TEMPLATES.get(esc_code, _UNKNOWN_BASIS_TEMPLATE).format(
+        year=year, base=base_rate, esc=escalation_value, years=year - 1, code=esc_code,
+    )
+
+
+def _compute_rates(
     esc_code: str,
     base_rate: Decimal,
     escalation_value: Decimal,
-    year: int,
-) -> tuple[Decimal, str]:
-    """Return (effective_tariff, calculation_basis) for a given year."""
-    if year == 1:
-        return base_rate, "Year 1: original contractual base rate"
+    term_years: int,
+) -> List[Decimal]:
+    """
+    Return the effective tariff for Years 1..term_years.
+
+    The escalation is accumulated year over year (running sum / running
+    product) instead of recomputing base + esc x n or (1 + esc)^n from
+    scratch for every year. Arithmetic stays in Decimal so ROUND_HALF_UP at
+    4 decimals matches the per-year formula.
+    """
+    rates = [base_rate]
+    step = 1 + escalation_value
+    increment = Decimal(0)
+    multiplier = Decimal(1)
 
-    y_minus_1 = year - 1
+    for _ in range(2, term_years + 1):
+        if esc_code == "FIXED_INCREASE":
+            increment += escalation_value
+            rate = (base_rate + increment).quantize(Decimal("0.0001"), rounding=ROUND_HALF_UP)
 
-    if esc_code == "NONE":
-        return base_rate, f"Year {year}: flat rate (no escalation)"
+        elif esc_code == "FIXED_DECREASE":
+            increment += escalation_value
+            rate = max(Decimal(0), base_rate - increment).quantize(Decimal("0.0001"), rounding=ROUND_HALF_UP)
 
-    if esc_code == "FIXED_INCREASE":
-        rate = (base_rate + escalation_value * y_minus_1).quantize(Decimal("0.0001"), rounding=ROUND_HALF_UP)
-        return rate, f"Year {year}: {base_rate} + {escalation_value} x {y_minus_1}"
+        elif esc_code == "PERCENTAGE":
+            multiplier *= step
+            rate = (base_rate * multiplier).quantize(Decimal("0.0001"), rounding=ROUND_HALF_UP)
 
-    if esc_code == "FIXED_DECREASE":
-        rate = max(Decimal(0), base_rate - escalation_value * y_minus_1).quantize(Decimal("0.0001"), rounding=ROUND_HALF_UP)
-        return rate, f"Year {year}: max(0, {base_rate} - {escalation_value} x {y_minus_1})"
+        else:
+            # NONE (and, defensively, unknown types): flat rate
+            rate = base_rate
 
-    if esc_code == "PERCENTAGE":
-        multiplier = (1 + escalation_value) ** y_minus_1
-        rate = (base_rate * multiplier).quantize(Decimal("0.0001"), rounding=ROUND_HALF_UP)
-        return rate, f"Year {year}: {base_rate} x (1 + {escalation_value})^{y_minus_1}"
+        rates.append(rate)
 
-    # Should not reach here for deterministic types
-    return base_rate, f"Year {year}: unknown escalation type {esc_code}"
+    return rates
 
 
 def _add_years(d: date, years: int) -> date:
     """Add N years to a date, handling Feb 29 → Feb 28."""
-    try:
-        return d.replace(year=d.year + years)
-    except ValueError:
+    year = d.year + years
+    if d.month == 2 and d.day == 29 and not calendar.isleap(year):
         # Feb 29 in a leap year → Feb 28 in non-leap year
-        return d.replace(year=d.year + years, day=28)
+        return date(year, 2, 28)
+    return d.replace(year=year)
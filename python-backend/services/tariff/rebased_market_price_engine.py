@@ -12,17 +12,34 @@ GHS is the system of record: MRP is in GHS, floor/ceiling are converted from USD
 to GHS at the monthly FX rate. USD billing amounts are derived from the GHS rate.
 """
 
+import calendar
 import json
 import logging
 from datetime import date, timedelta
 from decimal import Decimal, ROUND_HALF_UP
+from functools import partial
 from typing import Any, Dict, List, Optional
 
+from psycopg2.extras import execute_values
+
 from db.database import get_db_connection
 from services.calculations.market_reference_price import calculate_mrp
 
 logger = logging.getLogger(__name__)
 
+QUANTIZE_4 = Decimal("0.0001")
+QUANTIZE_8 = Decimal("0.00000001")
+
+# calculation_basis text for the monthly and annual tariff_rate rows
+_MONTHLY_BASIS_TEMPLATE = (
+    "MRP per kWh less {disc}% solar discount, "
+    "bounded by floor/ceiling (USD→local at monthly FX rate), "
+    "binding={binding}"
+)
+_ANNUAL_BASIS_TEMPLATE = (
+    "MRP per kWh less {disc}% solar discount, "
+    "bounded by floor/ceiling (USD), converted at monthly FX rate"
+)
 
 # =============================================================================
 # Formula Registry
@@ -54,30 +71,53 @@ FORMULA_REGISTRY = {
 }
 
 
+def _to_decimal(value: Any) -> Decimal:
+    """
+    Convert an invoice amount to Decimal, treating None/empty as 0.
+
+    Decimals and ints convert exactly and skip the str() round trip; floats
+    go through str() so the shortest repr is used, not the binary expansion.
+    """
+    if not value:
+        return Decimal(0)
+    if isinstance(value, (Decimal, int)):
+        return Decimal(value)
+    return Decimal(str(value))
+
+
+def _to_date(value: Any) -> date:
+    """Accept a date or an ISO date string."""
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
 # =============================================================================
 # Component Escalation
 # =============================================================================
 
+def _index_escalation_rules(escalation_rules: List[dict]) -> Dict[str, dict]:
+    """Map component name -> escalation rule (first rule wins per component)."""
+    rules_by_component: Dict[str, dict] = {}
+    for r in escalation_rules:
+        rules_by_component.setdefault(r.get("component"), r)
+    return rules_by_component
+
+
 def _escalate_component(
     base_value: Decimal,
     operating_year: int,
-    escalation_rules: List[dict],
+    rules_by_component: Dict[str, dict],
     component_name: str,
 ) -> Decimal:
     """
     Escalate a component (e.g. floor/ceiling) based on escalation_rules from
-    logic_parameters.
+    logic_parameters, indexed by _index_escalation_rules.
 
     Each rule: {"component": str, "escalation_type": str, "escalation_value": float, "start_year": int}
     - FIXED = compound percentage per year
     - ABSOLUTE = flat amount added per year
     - NONE = no escalation
     """
-    rule = None
-    for r in escalation_rules:
-        if r.get("component") == component_name:
-            rule = r
-            break
+    rule = rules_by_component.get(component_name)
 
     if rule is None:
         return base_value
@@ -98,7 +138,7 @@ def _escalate_component(
     if esc_type == "FIXED":
         # Compound percentage: base × (1 + pct)^years
         multiplier = (1 + esc_value) ** years_escalated
-        return (base_value * multiplier).quantize(Decimal("0.0001"), rounding=ROUND_HALF_UP)
+        return (base_value * multiplier).quantize(QUANTIZE_4, rounding=ROUND_HALF_UP)
 
     if esc_type == "ABSOLUTE":
         # Flat amount per year
@@ -114,6 +154,10 @@ def _escalate_component(
 class RebasedMarketPriceEngine:
     """Calculate and store rebased market price tariff rates."""
 
+    def __init__(self):
+        # currency.code -> currency.id; reference data, resolved once per engine
+        self._currency_ids: Dict[str, int] = {}
+
     def calculate_and_store(
         self,
         project_id: int,
@@ -142,8 +186,100 @@ class RebasedMarketPriceEngine:
         if not monthly_fx_rates:
             raise ValueError("monthly_fx_rates is required (1-12 entries)")
 
-        # 1. Fetch clause_tariff
-        tariff = self._fetch_tariff(project_id)
+        # One connection and transaction for the tariff read and all writes
+        with get_db_connection() as conn:
+            conn.autocommit = False
+            try:
+                # 1. Fetch clause_tariff
+                tariff = self._fetch_tariff(project_id, conn=conn)
+
+                result = self._calculate_and_write(
+                    conn,
+                    tariff=tariff,
+                    project_id=project_id,
+                    operating_year=operating_year,
+                    mrp_per_kwh=mrp_per_kwh,
+                    invoice_line_items=invoice_line_items,
+                    monthly_fx_rates=monthly_fx_rates,
+                    verification_status=verification_status,
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        return result
+
+    def calculate_and_store_bulk(self, items: List[Dict[str, Any]]) -> Dict[int, dict]:
+        """
+        Calculate and store rebased rates for many projects in one transaction.
+
+        Each item holds the calculate_and_store arguments for one project
+        (project_id, operating_year, monthly_fx_rates, and mrp_per_kwh or
+        invoice_line_items; verification_status optional). All tariffs are
+        fetched with one query and every write shares one connection, so an
+        end-of-month portfolio run pays one connection and one commit. Any
+        failure rolls back the whole batch.
+
+        Returns:
+            Dict of project_id -> calculate_and_store result.
+        """
+        for item in items:
+            if not item.get("monthly_fx_rates"):
+                raise ValueError(
+                    f"monthly_fx_rates is required (1-12 entries) for project {item.get('project_id')}"
+                )
+
+        results: Dict[int, dict] = {}
+        with get_db_connection() as conn:
+            conn.autocommit = False
+            try:
+                tariffs = self._fetch_tariffs([item["project_id"] for item in items], conn)
+
+                for item in items:
+                    project_id = item["project_id"]
+                    tariff = tariffs.get(project_id)
+                    if tariff is None:
+                        raise ValueError(
+                            f"No REBASED_MARKET_PRICE tariff found for project {project_id}"
+                        )
+                    results[project_id] = self._calculate_and_write(
+                        conn,
+                        tariff=tariff,
+                        project_id=project_id,
+                        operating_year=item["operating_year"],
+                        mrp_per_kwh=item.get("mrp_per_kwh"),
+                        invoice_line_items=item.get("invoice_line_items"),
+                        monthly_fx_rates=item["monthly_fx_rates"],
+                        verification_status=item.get("verification_status", "pending"),
+                    )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        logger.info(f"Rebased rates calculated for {len(results)} projects")
+        return results
+
+    # =========================================================================
+    # Private methods
+    # =========================================================================
+
+    def _calculate_and_write(
+        self,
+        conn,
+        tariff: dict,
+        project_id: int,
+        operating_year: int,
+        mrp_per_kwh: Optional[float],
+        invoice_line_items: Optional[List[dict]],
+        monthly_fx_rates: List[Dict[str, Any]],
+        verification_status: str,
+    ) -> dict:
+        """
+        Compute one project's rates from its clause_tariff and write them on
+        the caller's connection. Returns the calculate_and_store result.
+        """
         lp = tariff["logic_parameters"] or {}
 
         # 2. Validate logic_parameters
@@ -153,7 +289,7 @@ class RebasedMarketPriceEngine:
         discount_pct = Decimal(str(lp["discount_pct"]))
         base_floor = Decimal(str(lp["floor_rate"]))
         base_ceiling = Decimal(str(lp["ceiling_rate"]))
-        escalation_rules = lp.get("escalation_rules", [])
+        rules_by_component = _index_escalation_rules(lp.get("escalation_rules", []))
 
         # CPI-escalated overrides (set by USCPIEngine for floor_ceiling subtype)
         cpi_escalated_floor = lp.get("cpi_escalated_floor")
@@ -169,17 +305,14 @@ class RebasedMarketPriceEngine:
             mrp_local = calculate_mrp(lp, invoice_line_items)
             if mrp_local is None:
                 raise ValueError("MRP calculation returned None — insufficient invoice data")
-            # Capture totals for reference_price (MRP)
-            total_charges = sum(
-                Decimal(str(item.get("line_total_amount", 0) or 0))
-                for item in invoice_line_items
-                if item.get("invoice_line_item_type_code") == "VARIABLE_ENERGY"
-            )
-            total_kwh = sum(
-                Decimal(str(item.get("quantity", 0) or 0))
-                for item in invoice_line_items
-                if item.get("invoice_line_item_type_code") == "VARIABLE_ENERGY"
-            )
+            # Capture totals for reference_price (MRP), in one pass
+            total_charges = Decimal(0)
+            total_kwh = Decimal(0)
+            for item in invoice_line_items:
+                if item.get("invoice_line_item_type_code") != "VARIABLE_ENERGY":
+                    continue
+                total_charges += _to_decimal(item.get("line_total_amount"))
+                total_kwh += _to_decimal(item.get("quantity"))
             mrp_totals = {
                 "total_variable_charges": total_charges,
                 "total_kwh_invoiced": total_kwh,
@@ -191,55 +324,91 @@ class RebasedMarketPriceEngine:
         if cpi_escalated_floor is not None:
             escalated_floor = Decimal(str(cpi_escalated_floor))
         else:
-            escalated_floor = _escalate_component(base_floor, operating_year, escalation_rules, "min_solar_price")
+            escalated_floor = _escalate_component(base_floor, operating_year, rules_by_component, "min_solar_price")
 
         if cpi_escalated_ceiling is not None:
             escalated_ceiling = Decimal(str(cpi_escalated_ceiling))
         else:
-            escalated_ceiling = _escalate_component(base_ceiling, operating_year, escalation_rules, "max_solar_price")
+            escalated_ceiling = _escalate_component(base_ceiling, operating_year, rules_by_component, "max_solar_price")
 
         # 5. Calculate discounted MRP (constant for the year — MRP and discount don't vary monthly)
         discounted_mrp = mrp_local * (1 - discount_pct)
+        discounted_mrp_rounded = discounted_mrp.quantize(QUANTIZE_4, rounding=ROUND_HALF_UP)
+
+        discount_pct_100 = discount_pct * 100
+        disc_pct_display = int(discount_pct_100) if discount_pct_100 == int(discount_pct_100) else float(discount_pct_100)
 
         # 6. For each billing month: convert floor/ceiling USD→GHS, apply formula
         monthly_results = []
-        formula_fn = FORMULA_REGISTRY[formula_type]
-
-        for fx_entry in sorted(monthly_fx_rates, key=lambda x: x["billing_month"]):
-            billing_month = fx_entry["billing_month"]
-            if isinstance(billing_month, str):
-                billing_month = date.fromisoformat(billing_month)
-            fx_rate = Decimal(str(fx_entry["fx_rate"]))
-            rate_date = fx_entry["rate_date"]
-            if isinstance(rate_date, str):
-                rate_date = date.fromisoformat(rate_date)
-
-            floor_ghs = (escalated_floor * fx_rate).quantize(Decimal("0.0001"), rounding=ROUND_HALF_UP)
-            ceiling_ghs = (escalated_ceiling * fx_rate).quantize(Decimal("0.0001"), rounding=ROUND_HALF_UP)
-
-            effective_rate, rate_binding = formula_fn(
-                mrp_local=mrp_local,
-                discount_pct=discount_pct,
-                floor_local=floor_ghs,
-                ceiling_local=ceiling_ghs,
-            )
+        # Bind the year-constant inputs once; only floor/ceiling vary by month
+        formula_fn = partial(
+            FORMULA_REGISTRY[formula_type],
+            mrp_local=mrp_local,
+            discount_pct=discount_pct,
+        )
+
+        # Parse and order the FX entries once; the loop only does arithmetic
+        fx_entries = sorted(
+            [
+                (
+                    _to_date(e["billing_month"]),
+                    Decimal(str(e["fx_rate"])),
+                    _to_date(e["rate_date"]),
+                )
+                for e in monthly_fx_rates
+            ],
+            key=lambda entry: entry[0],
+        )
+
+        # Months quoted at the same FX rate share one computation
+        # (often a single quote is repeated across the whole year)
+        by_fx_rate: Dict[Decimal, tuple] = {}
+        monthly_breakdown: List[dict] = []
+        discounted_mrp_float = float(discounted_mrp_rounded)
+        basis_by_binding: Dict[str, str] = {}
+        for billing_month, fx_rate, rate_date in fx_entries:
+            computed = by_fx_rate.get(fx_rate)
+            if computed is None:
+                floor_ghs = (escalated_floor * fx_rate).quantize(QUANTIZE_4, rounding=ROUND_HALF_UP)
+                ceiling_ghs = (escalated_ceiling * fx_rate).quantize(QUANTIZE_4, rounding=ROUND_HALF_UP)
+
+                effective_rate, rate_binding = formula_fn(
+                    floor_local=floor_ghs,
+                    ceiling_local=ceiling_ghs,
+                )
 
-            effective_rate = effective_rate.quantize(Decimal("0.0001"), rounding=ROUND_HALF_UP)
+                effective_rate = effective_rate.quantize(QUANTIZE_4, rounding=ROUND_HALF_UP)
 
-            disc_pct_display = int(discount_pct * 100) if discount_pct * 100 == int(discount_pct * 100) else float(discount_pct * 100)
-            basis = (
-                f"MRP per kWh less {disc_pct_display}% solar discount, "
-                f"bounded by floor/ceiling (USD→local at monthly FX rate), "
-                f"binding={rate_binding}"
-            )
+                # Only rate_binding varies by month: format each basis once
+                basis = basis_by_binding.get(rate_binding)
+                if basis is None:
+                    basis = basis_by_binding[rate_binding] = _MONTHLY_BASIS_TEMPLATE.format(
+                        disc=disc_pct_display, binding=rate_binding,
+                    )
+
+                # Response values, converted to float once per FX rate
+                breakdown = {
+                    "fx_rate": float(fx_rate),
+                    "floor_ghs": float(floor_ghs),
+                    "ceiling_ghs": float(ceiling_ghs),
+                    "discounted_mrp_ghs": discounted_mrp_float,
+                    "effective_tariff_ghs": float(effective_rate),
+                    "rate_binding": rate_binding,
+                }
+
+                computed = by_fx_rate[fx_rate] = (
+                    floor_ghs, ceiling_ghs, effective_rate, rate_binding, basis, breakdown,
+                )
+            floor_ghs, ceiling_ghs, effective_rate, rate_binding, basis, breakdown = computed
 
+            monthly_breakdown.append({"billing_month": str(billing_month), **breakdown})
             monthly_results.append({
                 "billing_month": billing_month,
                 "fx_rate": fx_rate,
                 "rate_date": rate_date,
                 "floor_local": floor_ghs,
                 "ceiling_local": ceiling_ghs,
-                "discounted_mrp_local": discounted_mrp.quantize(Decimal("0.0001"), rounding=ROUND_HALF_UP),
+                "discounted_mrp_local": discounted_mrp_rounded,
                 "effective_tariff_local": effective_rate,
                 "rate_binding": rate_binding,
                 "calculation_basis": basis,
@@ -247,18 +416,14 @@ class RebasedMarketPriceEngine:
 
         # 7. Determine representative annual rate + final effective tariff
         # Representative annual rate = discounted MRP (before floor/ceiling — the annual anchor)
-        representative_rate = discounted_mrp.quantize(Decimal("0.0001"), rounding=ROUND_HALF_UP)
+        representative_rate = discounted_mrp_rounded
         # Final effective tariff = latest monthly effective rate
         latest_month = monthly_results[-1]
         final_effective_tariff = latest_month["effective_tariff_local"]
 
-        disc_pct_display = int(discount_pct * 100) if discount_pct * 100 == int(discount_pct * 100) else float(discount_pct * 100)
-        annual_basis = (
-            f"MRP per kWh less {disc_pct_display}% solar discount, "
-            f"bounded by floor/ceiling (USD), converted at monthly FX rate"
-        )
+        annual_basis = _ANNUAL_BASIS_TEMPLATE.format(disc=disc_pct_display)
 
-        # 8. Write to DB in a single transaction
+        # 8. Write to DB in the same transaction as the fetch
         result = self._write_to_db(
             tariff=tariff,
             operating_year=operating_year,
@@ -272,6 +437,7 @@ class RebasedMarketPriceEngine:
             discount_pct=discount_pct,
             escalated_floor=escalated_floor,
             escalated_ceiling=escalated_ceiling,
+            conn=conn,
         )
 
         logger.info(
@@ -292,51 +458,52 @@ class RebasedMarketPriceEngine:
             "final_effective_tariff": float(final_effective_tariff),
             "final_effective_tariff_source": "monthly",
             "formula_type": formula_type,
-            "monthly_breakdown": [
-                {
-                    "billing_month": str(m["billing_month"]),
-                    "fx_rate": float(m["fx_rate"]),
-                    "floor_ghs": float(m["floor_local"]),
-                    "ceiling_ghs": float(m["ceiling_local"]),
-                    "discounted_mrp_ghs": float(m["discounted_mrp_local"]),
-                    "effective_tariff_ghs": float(m["effective_tariff_local"]),
-                    "rate_binding": m["rate_binding"],
-                }
-                for m in monthly_results
-            ],
+            "monthly_breakdown": monthly_breakdown,
             **result,
         }
 
-    # =========================================================================
-    # Private methods
-    # =========================================================================
+    def _fetch_tariff(self, project_id: int, conn=None) -> dict:
+        """
+        Fetch the REBASED_MARKET_PRICE clause_tariff for a project.
 
-    def _fetch_tariff(self, project_id: int) -> dict:
-        """Fetch the REBASED_MARKET_PRICE clause_tariff for a project."""
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    SELECT ct.id, ct.base_rate, ct.valid_from, ct.currency_id,
-                           ct.market_ref_currency_id,
-                           ct.logic_parameters, ct.organization_id, ct.project_id,
-                           esc.code AS escalation_type_code,
-                           c.contract_term_years
-                    FROM clause_tariff ct
-                    JOIN contract c ON ct.contract_id = c.id
-                    JOIN escalation_type esc ON esc.id = ct.escalation_type_id
-                    WHERE ct.project_id = %s
-                      AND ct.is_current = true
-                      AND esc.code IN ('REBASED_MARKET_PRICE', 'FLOATING_GRID', 'FLOATING_GENERATOR', 'FLOATING_GRID_GENERATOR')
-                    """,
-                    (project_id,),
-                )
-                row = cur.fetchone()
-                if not row:
-                    raise ValueError(
-                        f"No REBASED_MARKET_PRICE tariff found for project {project_id}"
-                    )
-                return dict(row)
+        Reads on the caller's connection (and transaction) when one is given,
+        otherwise opens its own.
+        """
+        if conn is None:
+            with get_db_connection() as own_conn:
+                return self._fetch_tariff(project_id, conn=own_conn)
+
+        tariff = self._fetch_tariffs([project_id], conn).get(project_id)
+        if tariff is None:
+            raise ValueError(
+                f"No REBASED_MARKET_PRICE tariff found for project {project_id}"
+            )
+        return tariff
+
+    def _fetch_tariffs(self, project_ids: List[int], conn) -> Dict[int, dict]:
+        """Fetch the REBASED_MARKET_PRICE clause_tariff per project, keyed by project_id."""
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT ct.id, ct.base_rate, ct.valid_from, ct.currency_id,
+                       ct.market_ref_currency_id,
+                       ct.logic_parameters, ct.organization_id, ct.project_id,
+                       esc.code AS escalation_type_code,
+                       c.contract_term_years
+                FROM clause_tariff ct
+                JOIN contract c ON ct.contract_id = c.id
+                JOIN escalation_type esc ON esc.id = ct.escalation_type_id
+                WHERE ct.project_id = ANY(%s)
+                  AND ct.is_current = true
+                  AND esc.code IN ('REBASED_MARKET_PRICE', 'FLOATING_GRID', 'FLOATING_GENERATOR', 'FLOATING_GRID_GENERATOR')
+                """,
+                (list(project_ids),),
+            )
+            tariffs: Dict[int, dict] = {}
+            for row in cur.fetchall():
+                # One tariff per project, as the single-project fetch takes
+                tariffs.setdefault(row["project_id"], dict(row))
+            return tariffs
 
     def _validate_logic_parameters(self, lp: dict) -> None:
         """Validate required keys in logic_parameters."""
@@ -352,6 +519,16 @@ class RebasedMarketPriceEngine:
                 f"Available: {list(FORMULA_REGISTRY.keys())}"
             )
 
+    def _get_currency_id(self, cur, code: str) -> Optional[int]:
+        """Return currency.id for a code, querying only on first use."""
+        if code not in self._currency_ids:
+            cur.execute("SELECT id FROM currency WHERE code = %s", (code,))
+            row = cur.fetchone()
+            if not row:
+                return None
+            self._currency_ids[code] = row["id"]
+        return self._currency_ids[code]
+
     def _write_to_db(
         self,
         tariff: dict,
@@ -366,348 +543,371 @@ class RebasedMarketPriceEngine:
         discount_pct: Decimal,
         escalated_floor: Decimal,
         escalated_ceiling: Decimal,
+        conn,
     ) -> dict:
-        """Write results to exchange_rate, reference_price, and tariff_rate."""
+        """
+        Write results to exchange_rate, reference_price, and tariff_rate.
+
+        Runs on the caller's connection; the caller commits or rolls back.
+
+        The transaction commits with synchronous_commit off: COMMIT returns
+        before the WAL is flushed, so a server crash in that window can lose
+        the write (never corrupt it). Everything written here is re-derived
+        from the clause_tariff, MRP and FX inputs, so a lost write is redone by
+        re-running the calculation.
+        """
         ct_id = tariff["id"]
         org_id = tariff["organization_id"]
         currency_id = tariff["currency_id"]
         project_id = tariff["project_id"]
         valid_from = tariff["valid_from"]
 
-        with get_db_connection() as conn:
-            conn.autocommit = False
-            try:
-                with conn.cursor() as cur:
-                    # Get currency IDs — resolve from clause_tariff metadata
-                    cur.execute("SELECT id FROM currency WHERE code = 'USD'")
-                    usd_row = cur.fetchone()
-                    usd_currency_id = usd_row["id"] if usd_row else None
-
-                    # hard = USD (floor/ceiling are denominated in USD)
-                    hard_ccy_from_tariff = usd_currency_id or currency_id
-                    # local = market_ref_currency (GHS — local market currency where MRP is denominated)
-                    local_ccy_from_tariff = tariff.get("market_ref_currency_id") or currency_id
-
-                    # --- a. exchange_rate: 1 row per month ---
-                    fx_id_map = {}  # billing_month -> exchange_rate.id
-                    for m in monthly_results:
-                        cur.execute(
-                            """
-                            INSERT INTO exchange_rate
-                                (organization_id, currency_id, rate_date, rate, source)
-                            VALUES (%s, %s, %s, %s, %s)
-                            ON CONFLICT (organization_id, currency_id, rate_date)
-                            DO UPDATE SET rate = EXCLUDED.rate, source = EXCLUDED.source
-                            RETURNING id
-                            """,
-                            (
-                                org_id,
-                                local_ccy_from_tariff,
-                                m["rate_date"],
-                                m["fx_rate"],
-                                "rebased_market_price_engine",
-                            ),
-                        )
-                        fx_id_map[m["billing_month"]] = cur.fetchone()["id"]
-
-                    # --- b. reference_price: annual MRP observation ---
-                    if hasattr(valid_from, "date"):
-                        valid_from = valid_from.date()
-
-                    period_start = _add_years(valid_from, operating_year - 1)
-                    period_end = _add_years(valid_from, operating_year) - timedelta(days=1)
-
-                    cur.execute(
-                        """
-                        INSERT INTO reference_price
-                            (project_id, organization_id, operating_year, period_start,
-                             period_end, calculated_mrp_per_kwh, currency_id,
-                             total_variable_charges, total_kwh_invoiced,
-                             verification_status, observation_type)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'annual')
-                        ON CONFLICT (project_id, operating_year)
-                            WHERE observation_type = 'annual'
-                        DO UPDATE SET
-                            calculated_mrp_per_kwh = EXCLUDED.calculated_mrp_per_kwh,
-                            period_start = EXCLUDED.period_start,
-                            period_end = EXCLUDED.period_end,
-                            total_variable_charges = EXCLUDED.total_variable_charges,
-                            total_kwh_invoiced = EXCLUDED.total_kwh_invoiced,
-                            verification_status = EXCLUDED.verification_status,
-                            updated_at = NOW()
-                        RETURNING id
-                        """,
-                        (
-                            project_id,
-                            org_id,
-                            operating_year,
-                            period_start,
-                            period_end,
-                            mrp_local,
-                            local_ccy_from_tariff,
-                            mrp_totals.get("total_variable_charges"),
-                            mrp_totals.get("total_kwh_invoiced"),
-                            verification_status,
-                        ),
-                    )
-                    ref_price_id = cur.fetchone()["id"]
-
-                    latest_month_date = max(m["billing_month"] for m in monthly_results)
-
-                    # =============================================================
-                    # c. tariff_rate: unified table
-                    # =============================================================
-
-                    # Currency FKs: hard=clause_tariff.currency_id (USD), local=market_ref (GHS), billing=local (GHS)
-                    hard_ccy_id = hard_ccy_from_tariff
-                    local_ccy_id = local_ccy_from_tariff
-                    billing_ccy_id = local_ccy_from_tariff  # billing in local currency (GHS)
-
-                    # --- c1. Annual row in tariff_rate ---
-                    # For annual: representative_rate is discounted MRP in local ccy
-                    # Convert to hard ccy using a reference FX rate (use latest month's rate)
-                    latest_fx = monthly_results[-1]["fx_rate"]
-                    annual_hard = (representative_rate / latest_fx).quantize(
-                        Decimal("0.00000001"), rounding=ROUND_HALF_UP
-                    ) if latest_fx else None
-
-                    # Clear is_current on existing annual tariff_rate rows
-                    cur.execute(
-                        """
-                        UPDATE tariff_rate SET is_current = false
-                        WHERE clause_tariff_id = %s AND rate_granularity = 'annual' AND is_current = true
-                        """,
-                        (ct_id,),
-                    )
-
-                    cur.execute(
-                        """
-                        INSERT INTO tariff_rate (
-                            clause_tariff_id, operating_year, rate_granularity,
-                            period_start, period_end,
-                            hard_currency_id, local_currency_id, billing_currency_id,
-                            exchange_rate_id,
-                            effective_rate_contract_ccy, effective_rate_hard_ccy,
-                            effective_rate_local_ccy, effective_rate_billing_ccy,
-                            effective_rate_contract_role,
-                            calc_detail,
-                            rate_binding,
-                            reference_price_id, discount_pct_applied, formula_version,
-                            calc_status, calculation_basis, is_current
-                        ) VALUES (
-                            %s, %s, 'annual',
-                            %s, %s,
-                            %s, %s, %s,
-                            %s,
-                            %s, %s, %s, %s,
-                            'local',
-                            NULL,
-                            'fixed',
-                            %s, %s, 'rebased_v1',
-                            'computed', %s, true
-                        )
-                        ON CONFLICT (clause_tariff_id, operating_year)
-                            WHERE rate_granularity = 'annual'
-                        DO UPDATE SET
-                            effective_rate_contract_ccy = EXCLUDED.effective_rate_contract_ccy,
-                            effective_rate_hard_ccy = EXCLUDED.effective_rate_hard_ccy,
-                            effective_rate_local_ccy = EXCLUDED.effective_rate_local_ccy,
-                            effective_rate_billing_ccy = EXCLUDED.effective_rate_billing_ccy,
-                            exchange_rate_id = EXCLUDED.exchange_rate_id,
-                            reference_price_id = EXCLUDED.reference_price_id,
-                            discount_pct_applied = EXCLUDED.discount_pct_applied,
-                            calc_status = 'computed',
-                            calculation_basis = EXCLUDED.calculation_basis,
-                            is_current = true,
-                            updated_at = NOW()
-                        """,
-                        (
-                            ct_id, operating_year,
-                            period_start, period_end,
-                            hard_ccy_id, local_ccy_id, billing_ccy_id,
-                            fx_id_map[latest_month_date],  # exchange_rate_id = latest month's FX
-                            representative_rate,   # contract_ccy = local
-                            annual_hard,           # hard_ccy
-                            representative_rate,   # local_ccy
-                            representative_rate,   # billing_ccy = local
-                            ref_price_id, discount_pct,
-                            annual_basis,
-                        ),
-                    )
+        with conn.cursor() as cur:
+            # Reverts at the end of this transaction
+            cur.execute("SET LOCAL synchronous_commit = off")
+
+            # Get currency IDs — resolve from clause_tariff metadata
+            usd_currency_id = self._get_currency_id(cur, "USD")
+
+            # hard = USD (floor/ceiling are denominated in USD)
+            hard_ccy_from_tariff = usd_currency_id or currency_id
+            # local = market_ref_currency (GHS — local market currency where MRP is denominated)
+            local_ccy_from_tariff = tariff.get("market_ref_currency_id") or currency_id
+
+            # --- a. exchange_rate: 1 row per month, one statement ---
+            # Keyed by rate_date: a row may only be upserted once per
+            # statement, and a later month's rate wins as before
+            fx_rows = {
+                m["rate_date"]: (
+                    org_id,
+                    local_ccy_from_tariff,
+                    m["rate_date"],
+                    m["fx_rate"],
+                    "rebased_market_price_engine",
+                )
+                for m in monthly_results
+            }
+            fx_returned = execute_values(
+                cur,
+                """
+                INSERT INTO exchange_rate
+                    (organization_id, currency_id, rate_date, rate, source)
+                VALUES %s
+                ON CONFLICT (organization_id, currency_id, rate_date)
+                DO UPDATE SET rate = EXCLUDED.rate, source = EXCLUDED.source
+                RETURNING id, rate_date
+                """,
+                list(fx_rows.values()),
+                page_size=len(fx_rows),
+                fetch=True,
+            )
+            fx_id_by_date = {row["rate_date"]: row["id"] for row in fx_returned}
+            # billing_month -> exchange_rate.id
+            fx_id_map = {
+                m["billing_month"]: fx_id_by_date[m["rate_date"]]
+                for m in monthly_results
+            }
 
-                    # Ensure only this annual row is current
-                    cur.execute(
-                        """
-                        UPDATE tariff_rate SET is_current = false
-                        WHERE clause_tariff_id = %s AND rate_granularity = 'annual'
-                          AND operating_year != %s AND is_current = true
-                        """,
-                        (ct_id, operating_year),
-                    )
+            # --- b. reference_price: annual MRP observation ---
+            if hasattr(valid_from, "date"):
+                valid_from = valid_from.date()
+
+            period_start = _add_years(valid_from, operating_year - 1)
+            period_end = _add_years(valid_from, operating_year) - timedelta(days=1)
+
+            cur.execute(
+                """
+                INSERT INTO reference_price
+                    (project_id, organization_id, operating_year, period_start,
+                     period_end, calculated_mrp_per_kwh, currency_id,
+                     total_variable_charges, total_kwh_invoiced,
+                     verification_status, observation_type)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'annual')
+                ON CONFLICT (project_id, operating_year)
+                    WHERE observation_type = 'annual'
+                DO UPDATE SET
+                    calculated_mrp_per_kwh = EXCLUDED.calculated_mrp_per_kwh,
+                    period_start = EXCLUDED.period_start,
+                    period_end = EXCLUDED.period_end,
+                    total_variable_charges = EXCLUDED.total_variable_charges,
+                    total_kwh_invoiced = EXCLUDED.total_kwh_invoiced,
+                    verification_status = EXCLUDED.verification_status,
+                    updated_at = NOW()
+                RETURNING id
+                """,
+                (
+                    project_id,
+                    org_id,
+                    operating_year,
+                    period_start,
+                    period_end,
+                    mrp_local,
+                    local_ccy_from_tariff,
+                    mrp_totals.get("total_variable_charges"),
+                    mrp_totals.get("total_kwh_invoiced"),
+                    verification_status,
+                ),
+            )
+            ref_price_id = cur.fetchone()["id"]
+
+            # monthly_results is ordered by billing_month; the last is the latest
+            latest_idx = len(monthly_results) - 1
+            latest_month_date = monthly_results[latest_idx]["billing_month"]
+
+            # =============================================================
+            # c. tariff_rate: unified table
+            # =============================================================
+
+            # Currency FKs: hard=clause_tariff.currency_id (USD), local=market_ref (GHS), billing=local (GHS)
+            hard_ccy_id = hard_ccy_from_tariff
+            local_ccy_id = local_ccy_from_tariff
+            billing_ccy_id = local_ccy_from_tariff  # billing in local currency (GHS)
+
+            # --- c1. Annual row in tariff_rate ---
+            # For annual: representative_rate is discounted MRP in local ccy
+            # Convert to hard ccy using a reference FX rate (use latest month's rate)
+            latest_fx = monthly_results[-1]["fx_rate"]
+            annual_hard = (representative_rate / latest_fx).quantize(
+                QUANTIZE_8, rounding=ROUND_HALF_UP
+            ) if latest_fx else None
+
+            # Clear is_current on the existing annual rows first, as its own
+            # statement. uq_tariff_rate_current_annual is not deferrable, and
+            # a writable CTE the upsert does not read would run after it,
+            # so the upsert would still see the old current row
+            cur.execute(
+                """
+                UPDATE tariff_rate SET is_current = false
+                WHERE clause_tariff_id = %s AND rate_granularity = 'annual' AND is_current = true
+                """,
+                (ct_id,),
+            )
 
-                    # --- c2. Monthly rows in tariff_rate ---
-                    # Clear is_current on existing monthly tariff_rate rows
-                    cur.execute(
-                        """
-                        UPDATE tariff_rate SET is_current = false
-                        WHERE clause_tariff_id = %s AND rate_granularity = 'monthly' AND is_current = true
-                        """,
-                        (ct_id,),
-                    )
+            cur.execute(
+                """
+                INSERT INTO tariff_rate (
+                    clause_tariff_id, operating_year, rate_granularity,
+                    period_start, period_end,
+                    hard_currency_id, local_currency_id, billing_currency_id,
+                    exchange_rate_id,
+                    effective_rate_contract_ccy, effective_rate_hard_ccy,
+                    effective_rate_local_ccy, effective_rate_billing_ccy,
+                    effective_rate_contract_role,
+                    calc_detail,
+                    rate_binding,
+                    reference_price_id, discount_pct_applied, formula_version,
+                    calc_status, calculation_basis, is_current
+                ) VALUES (
+                    %s, %s, 'annual',
+                    %s, %s,
+                    %s, %s, %s,
+                    %s,
+                    %s, %s, %s, %s,
+                    'local',
+                    NULL,
+                    'fixed',
+                    %s, %s, 'rebased_v1',
+                    'computed', %s, true
+                )
+                ON CONFLICT (clause_tariff_id, operating_year)
+                    WHERE rate_granularity = 'annual'
+                DO UPDATE SET
+                    effective_rate_contract_ccy = EXCLUDED.effective_rate_contract_ccy,
+                    effective_rate_hard_ccy = EXCLUDED.effective_rate_hard_ccy,
+                    effective_rate_local_ccy = EXCLUDED.effective_rate_local_ccy,
+                    effective_rate_billing_ccy = EXCLUDED.effective_rate_billing_ccy,
+                    exchange_rate_id = EXCLUDED.exchange_rate_id,
+                    reference_price_id = EXCLUDED.reference_price_id,
+                    discount_pct_applied = EXCLUDED.discount_pct_applied,
+                    calc_status = 'computed',
+                    calculation_basis = EXCLUDED.calculation_basis,
+                    is_current = true,
+                    updated_at = NOW()
+                """,
+                (
+                    ct_id, operating_year,
+                    period_start, period_end,
+                    hard_ccy_id, local_ccy_id, billing_ccy_id,
+                    fx_id_map[latest_month_date],  # exchange_rate_id = latest month's FX
+                    representative_rate,   # contract_ccy = local
+                    annual_hard,           # hard_ccy
+                    representative_rate,   # local_ccy
+                    representative_rate,   # billing_ccy = local
+                    ref_price_id, discount_pct,
+                    annual_basis,
+                ),
+            )
 
-                    # Pre-load billing_period lookup: (year, month) → id
-                    cur.execute("SELECT id, start_date FROM billing_period ORDER BY start_date")
-                    bp_rows = cur.fetchall()
-                    bp_by_ym = {}
-                    for bp in bp_rows:
-                        if bp['start_date']:
-                            sd = bp['start_date'].date() if hasattr(bp['start_date'], 'date') else bp['start_date']
-                            bp_by_ym[(sd.year, sd.month)] = bp['id']
-
-                    new_monthly_ids = []
-                    for m in monthly_results:
-                        is_current = (m["billing_month"] == latest_month_date)
-                        fx_rate = m["fx_rate"]
-                        fx_local_id = fx_id_map[m["billing_month"]]
-                        bp_id = bp_by_ym.get((m["billing_month"].year, m["billing_month"].month))
-
-                        # Look up monthly reference_price if it exists, else fall back to annual
-                        cur.execute("""
-                            SELECT id FROM reference_price
-                            WHERE project_id = %s AND observation_type = 'monthly'
-                              AND period_start = %s
-                            LIMIT 1
-                        """, (project_id, m["billing_month"]))
-                        monthly_ref_row = cur.fetchone()
-                        monthly_ref_id = monthly_ref_row["id"] if monthly_ref_row else ref_price_id
-
-                        # Compute hard-currency values
-                        eff_hard = (m["effective_tariff_local"] / fx_rate).quantize(
-                            Decimal("0.00000001"), rounding=ROUND_HALF_UP
-                        ) if fx_rate else None
-
-                        # Build calc_detail JSONB
-                        floor_hard = (m["floor_local"] / fx_rate).quantize(
-                            Decimal("0.00000001"), rounding=ROUND_HALF_UP
-                        ) if fx_rate else None
-                        ceiling_hard = (m["ceiling_local"] / fx_rate).quantize(
-                            Decimal("0.00000001"), rounding=ROUND_HALF_UP
-                        ) if fx_rate else None
-                        disc_hard = (m["discounted_mrp_local"] / fx_rate).quantize(
-                            Decimal("0.00000001"), rounding=ROUND_HALF_UP
-                        ) if fx_rate else None
-
-                        calc_detail = json.dumps({
-                            "floor": {
-                                "contract_ccy": float(floor_hard) if floor_hard else None,
-                                "hard_ccy": float(floor_hard) if floor_hard else None,
-                                "local_ccy": float(m["floor_local"]),
-                                "billing_ccy": float(m["floor_local"]),
-                                "contract_role": "hard",
-                            },
-                            "ceiling": {
-                                "contract_ccy": float(ceiling_hard) if ceiling_hard else None,
-                                "hard_ccy": float(ceiling_hard) if ceiling_hard else None,
-                                "local_ccy": float(m["ceiling_local"]),
-                                "billing_ccy": float(m["ceiling_local"]),
-                                "contract_role": "hard",
-                            },
-                            "discounted_base": {
-                                "contract_ccy": float(m["discounted_mrp_local"]),
-                                "hard_ccy": float(disc_hard) if disc_hard else None,
-                                "local_ccy": float(m["discounted_mrp_local"]),
-                                "billing_ccy": float(m["discounted_mrp_local"]),
-                                "contract_role": "local",
-                            },
-                            "mrp_per_kwh": float(mrp_local),
-                            "discount_pct": float(discount_pct),
-                            "escalated_floor_usd": float(escalated_floor),
-                            "escalated_ceiling_usd": float(escalated_ceiling),
-                            "fx_rate": float(fx_rate),
-                            "formula": "MAX(floor_local, MIN(discounted_base_local, ceiling_local))",
-                        })
-
-                        month_end = (m["billing_month"].replace(day=28) + timedelta(days=4))
-                        month_end = month_end.replace(day=1) - timedelta(days=1)
-
-                        cur.execute(
-                            """
-                            INSERT INTO tariff_rate (
-                                clause_tariff_id, operating_year, rate_granularity,
-                                billing_month, billing_period_id, period_start, period_end,
-                                hard_currency_id, local_currency_id, billing_currency_id,
-                                exchange_rate_id,
-                                effective_rate_contract_ccy, effective_rate_hard_ccy,
-                                effective_rate_local_ccy, effective_rate_billing_ccy,
-                                effective_rate_contract_role,
-                                calc_detail,
-                                rate_binding,
-                                reference_price_id, discount_pct_applied, formula_version,
-                                calc_status, calculation_basis, is_current
-                            ) VALUES (
-                                %s, %s, 'monthly',
-                                %s, %s, %s, %s,
-                                %s, %s, %s,
-                                %s,
-                                %s, %s, %s, %s,
-                                'local',
-                                %s::jsonb,
-                                %s,
-                                %s, %s, 'rebased_v1',
-                                'computed', %s, %s
-                            )
-                            ON CONFLICT (clause_tariff_id, billing_month)
-                                WHERE rate_granularity = 'monthly'
-                            DO UPDATE SET
-                                billing_period_id = EXCLUDED.billing_period_id,
-                                exchange_rate_id = EXCLUDED.exchange_rate_id,
-                                effective_rate_contract_ccy = EXCLUDED.effective_rate_contract_ccy,
-                                effective_rate_hard_ccy = EXCLUDED.effective_rate_hard_ccy,
-                                effective_rate_local_ccy = EXCLUDED.effective_rate_local_ccy,
-                                effective_rate_billing_ccy = EXCLUDED.effective_rate_billing_ccy,
-                                calc_detail = EXCLUDED.calc_detail,
-                                rate_binding = EXCLUDED.rate_binding,
-                                reference_price_id = EXCLUDED.reference_price_id,
-                                discount_pct_applied = EXCLUDED.discount_pct_applied,
-                                calc_status = 'computed',
-                                calculation_basis = EXCLUDED.calculation_basis,
-                                is_current = EXCLUDED.is_current,
-                                updated_at = NOW()
-                            RETURNING id
-                            """,
-                            (
-                                ct_id, operating_year,
-                                m["billing_month"], bp_id, m["billing_month"], month_end,
-                                hard_ccy_id, local_ccy_id, billing_ccy_id,
-                                fx_local_id,
-                                m["effective_tariff_local"],  # contract_ccy = local
-                                eff_hard,                     # hard_ccy
-                                m["effective_tariff_local"],  # local_ccy
-                                m["effective_tariff_local"],  # billing_ccy = local
-                                calc_detail,
-                                m["rate_binding"],
-                                monthly_ref_id, discount_pct,
-                                m["calculation_basis"], is_current,
-                            ),
-                        )
-                        new_monthly_ids.append(cur.fetchone()["id"])
+            # --- c2. Monthly rows in tariff_rate ---
+            # Pre-load billing_period lookup: (year, month) → id
+            cur.execute("SELECT id, start_date FROM billing_period ORDER BY start_date")
+            bp_rows = cur.fetchall()
+            bp_by_ym = {}
+            for bp in bp_rows:
+                if bp['start_date']:
+                    sd = bp['start_date'].date() if hasattr(bp['start_date'], 'date') else bp['start_date']
+                    bp_by_ym[(sd.year, sd.month)] = bp['id']
+
+            # Monthly reference_price rows for these months (one query);
+            # months without one fall back to the annual row
+            cur.execute("""
+                SELECT DISTINCT ON (period_start) id, period_start
+                FROM reference_price
+                WHERE project_id = %s AND observation_type = 'monthly'
+                  AND period_start = ANY(%s)
+                ORDER BY period_start, id
+            """, (project_id, [m["billing_month"] for m in monthly_results]))
+            monthly_ref_by_start = {
+                (r["period_start"].date() if hasattr(r["period_start"], "date") else r["period_start"]): r["id"]
+                for r in cur.fetchall()
+            }
 
-                conn.commit()
+            # Keyed by billing_month: a row may only be upserted once per
+            # statement, so a repeated month keeps its last entry (as fx_rows)
+            monthly_rows = {}
+            for idx, m in enumerate(monthly_results):
+                is_current = (idx == latest_idx)
+                fx_rate = m["fx_rate"]
+                fx_local_id = fx_id_map[m["billing_month"]]
+                bp_id = bp_by_ym.get((m["billing_month"].year, m["billing_month"].month))
+                monthly_ref_id = monthly_ref_by_start.get(m["billing_month"], ref_price_id)
+
+                # Compute hard-currency values
+                eff_hard = (m["effective_tariff_local"] / fx_rate).quantize(
+                    QUANTIZE_8, rounding=ROUND_HALF_UP
+                ) if fx_rate else None
+
+                # Build calc_detail JSONB
+                floor_hard = (m["floor_local"] / fx_rate).quantize(
+                    QUANTIZE_8, rounding=ROUND_HALF_UP
+                ) if fx_rate else None
+                ceiling_hard = (m["ceiling_local"] / fx_rate).quantize(
+                    QUANTIZE_8, rounding=ROUND_HALF_UP
+                ) if fx_rate else None
+                disc_hard = (m["discounted_mrp_local"] / fx_rate).quantize(
+                    QUANTIZE_8, rounding=ROUND_HALF_UP
+                ) if fx_rate else None
+
+                calc_detail = json.dumps({
+                    "floor": {
+                        "contract_ccy": float(floor_hard) if floor_hard else None,
+                        "hard_ccy": float(floor_hard) if floor_hard else None,
+                        "local_ccy": float(m["floor_local"]),
+                        "billing_ccy": float(m["floor_local"]),
+                        "contract_role": "hard",
+                    },
+                    "ceiling": {
+                        "contract_ccy": float(ceiling_hard) if ceiling_hard else None,
+                        "hard_ccy": float(ceiling_hard) if ceiling_hard else None,
+                        "local_ccy": float(m["ceiling_local"]),
+                        "billing_ccy": float(m["ceiling_local"]),
+                        "contract_role": "hard",
+                    },
+                    "discounted_base": {
+                        "contract_ccy": float(m["discounted_mrp_local"]),
+                        "hard_ccy": float(disc_hard) if disc_hard else None,
+                        "local_ccy": float(m["discounted_mrp_local"]),
+                        "billing_ccy": float(m["discounted_mrp_local"]),
+                        "contract_role": "local",
+                    },
+                    "mrp_per_kwh": float(mrp_local),
+                    "discount_pct": float(discount_pct),
+                    "escalated_floor_usd": float(escalated_floor),
+                    "escalated_ceiling_usd": float(escalated_ceiling),
+                    "fx_rate": float(fx_rate),
+                    "formula": "MAX(floor_local, MIN(discounted_base_local, ceiling_local))",
+                })
+
+                month_end = (m["billing_month"].replace(day=28) + timedelta(days=4))
+                month_end = month_end.replace(day=1) - timedelta(days=1)
+
+                monthly_rows[m["billing_month"]] = (
+                    ct_id, operating_year,
+                    m["billing_month"], bp_id, m["billing_month"], month_end,
+                    hard_ccy_id, local_ccy_id, billing_ccy_id,
+                    fx_local_id,
+                    m["effective_tariff_local"],  # contract_ccy = local
+                    eff_hard,                     # hard_ccy
+                    m["effective_tariff_local"],  # local_ccy
+                    m["effective_tariff_local"],  # billing_ccy = local
+                    calc_detail,
+                    m["rate_binding"],
+                    monthly_ref_id, discount_pct,
+                    m["calculation_basis"], is_current,
+                )
 
-                return {
-                    "reference_price_id": ref_price_id,
-                    "tariff_rate_monthly_ids": new_monthly_ids,
-                    "exchange_rate_ids": list(fx_id_map.values()),
-                }
+            # Clear is_current on the existing monthly rows before the upsert
+            # (see the annual clear above)
+            cur.execute(
+                """
+                UPDATE tariff_rate SET is_current = false
+                WHERE clause_tariff_id = %s AND rate_granularity = 'monthly' AND is_current = true
+                """,
+                (ct_id,),
+            )
+            monthly_returned = execute_values(
+                cur,
+                """
+                INSERT INTO tariff_rate (
+                    clause_tariff_id, operating_year, rate_granularity,
+                    billing_month, billing_period_id, period_start, period_end,
+                    hard_currency_id, local_currency_id, billing_currency_id,
+                    exchange_rate_id,
+                    effective_rate_contract_ccy, effective_rate_hard_ccy,
+                    effective_rate_local_ccy, effective_rate_billing_ccy,
+                    effective_rate_contract_role,
+                    calc_detail,
+                    rate_binding,
+                    reference_price_id, discount_pct_applied, formula_version,
+                    calc_status, calculation_basis, is_current
+                ) VALUES %s
+                ON CONFLICT (clause_tariff_id, billing_month)
+                    WHERE rate_granularity = 'monthly'
+                DO UPDATE SET
+                    billing_period_id = EXCLUDED.billing_period_id,
+                    exchange_rate_id = EXCLUDED.exchange_rate_id,
+                    effective_rate_contract_ccy = EXCLUDED.effective_rate_contract_ccy,
+                    effective_rate_hard_ccy = EXCLUDED.effective_rate_hard_ccy,
+                    effective_rate_local_ccy = EXCLUDED.effective_rate_local_ccy,
+                    effective_rate_billing_ccy = EXCLUDED.effective_rate_billing_ccy,
+                    calc_detail = EXCLUDED.calc_detail,
+                    rate_binding = EXCLUDED.rate_binding,
+                    reference_price_id = EXCLUDED.reference_price_id,
+                    discount_pct_applied = EXCLUDED.discount_pct_applied,
+                    calc_status = 'computed',
+                    calculation_basis = EXCLUDED.calculation_basis,
+                    is_current = EXCLUDED.is_current,
+                    updated_at = NOW()
+                RETURNING id, billing_month
+                """,
+                list(monthly_rows.values()),
+                template=(
+                    "(%s, %s, 'monthly', %s, %s, %s, %s, %s, %s, %s, %s, "
+                    "%s, %s, %s, %s, 'local', %s::jsonb, %s, %s, %s, 'rebased_v1', "
+                    "'computed', %s, %s)"
+                ),
+                page_size=len(monthly_rows),
+                fetch=True,
+            )
+            # Keep ids in monthly_results order
+            monthly_id_by_month = {
+                (r["billing_month"].date() if hasattr(r["billing_month"], "date") else r["billing_month"]): r["id"]
+                for r in monthly_returned
+            }
+            new_monthly_ids = [
+                monthly_id_by_month[m["billing_month"]] for m in monthly_results
+            ]
 
-            except Exception:
-                conn.rollback()
-                raise
+        return {
+            "reference_price_id": ref_price_id,
+            "tariff_rate_monthly_ids": new_monthly_ids,
+            "exchange_rate_ids": list(fx_id_map.values()),
+        }
 
 
 def _add_years(d: date, years: int) -> date:
     """Add N years to a date, handling Feb 29 → Feb 28."""
-    try:
-        return d.replace(year=d.year + years)
-    except ValueError:
-        return d.replace(year=d.year + years, day=28)
+    year = d.year + years
+    if d.month == 2 and d.day == 29 and not calendar.isleap(year):
+        return d.replace(year=year, day=28)
+    return d.replace(year=year)
@@ -11,23 +11,25 @@ from dotenv import load_dotenv
 from db.database import init_connection_pool, close_connection_pool, health_check
 
 
-@pytest.fixture(scope="module")
+def pytest_configure(config):
+    """Load environment variables from .env once, before any test module is imported."""
+    load_dotenv()
+
+
+@pytest.fixture(scope="session")
 def db_connection():
     """
     Initialize database connection pool for tests.
 
     This fixture:
-    - Loads environment variables from .env file
     - Checks for required DATABASE_URL and ENCRYPTION_KEY
     - Initializes the connection pool
     - Verifies database connectivity
     - Cleans up connection pool after tests complete
 
-    Scope is 'module' to share connection pool across all tests in a module.
+    Scope is 'session' so the pool (and its connection handshakes) is set up
+    once for the whole run rather than once per test module.
     """
-    # Load environment variables from .env file
-    load_dotenv()
-
     # Check required environment variables
     if not os.getenv("DATABASE_URL"):
         pytest.skip("DATABASE_URL not set - skipping database tests")
@@ -43,5 +45,42 @@ def db_connection():
 
     yield
 
-    # Cleanup - close connection pool after all tests in module complete
+    # Cleanup - close connection pool after all tests complete
     close_connection_pool()
+
+
+@pytest.fixture(scope="session")
+def app():
+    """
+    The FastAPI application under test.
+
+    main is imported here rather than at module level so test collection
+    (and non-API tests) do not pay for the app's router wiring and
+    import-time service setup. Tests can use app.dependency_overrides on
+    this object.
+    """
+    from main import app as _app
+
+    return _app
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """
+    FastAPI TestClient shared by all API tests.
+
+    Created once per session. It is not entered as a context manager, so the
+    app lifespan (which starts the email notification scheduler) does not
+    run, matching the per-module clients it replaces.
+    """
+    from fastapi.testclient import TestClient
+
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def openapi_spec(client):
+    """The app's OpenAPI document, fetched and parsed once per session."""
+    response = client.get("/openapi.json")
+    assert response.status_code == 200
+    return response.json()
@@ -5,20 +5,32 @@ Tests the /api/contracts/* endpoints with mocked services.
 """
 
 import pytest
-from fastapi.testclient import TestClient
 from unittest.mock import Mock, patch
 import io
 
-from main import app
 from models.contract import ExtractedClause, ContractParseResult
 from services.contract_parser import (
+    ContractParser,
     ContractParserError,
     DocumentParsingError,
     ClauseExtractionError,
 )
 
-# Create test client
-client = TestClient(app)
+# 11MB upload, just over the parse endpoint's 10MB limit
+LARGE_BLOB = b"\x00" * (11 << 20)
+
+
+@pytest.fixture
+def mock_parser():
+    """
+    Patch the contracts API's ContractParser and return the instance it builds.
+
+    The instance is specced on ContractParser, so tests that touch a method
+    the real parser no longer has fail instead of silently passing.
+    """
+    parser = Mock(spec=ContractParser)
+    with patch("api.contracts.ContractParser", return_value=parser):
+        yield parser
 
 
 @pytest.fixture
@@ -55,7 +67,7 @@ def sample_parse_result(sample_clause):
     )
 
 
-def test_health_endpoint():
+def test_health_endpoint(client):
     """Test health check endpoint."""
     response = client.get("/health")
     assert response.status_code == 200
@@ -64,7 +76,7 @@ def test_health_endpoint():
     assert data["service"] == "energy-contract-compliance-backend"
 
 
-def test_root_endpoint():
+def test_root_endpoint(client):
     """Test root endpoint."""
     response = client.get("/")
     assert response.status_code == 200
@@ -73,13 +85,9 @@ def test_root_endpoint():
     assert data["status"] == "running"
 
 
-@patch("api.contracts.ContractParser")
-def test_parse_contract_success(mock_parser_class, sample_parse_result):
+def test_parse_contract_success(mock_parser, sample_parse_result, client):
     """Test successful contract parsing."""
-    # Mock ContractParser
-    mock_parser = Mock()
     mock_parser.process_contract.return_value = sample_parse_result
-    mock_parser_class.return_value = mock_parser
 
     # Create test file
     file_content = b"%PDF-1.4 sample content"
@@ -104,7 +112,7 @@ def test_parse_contract_success(mock_parser_class, sample_parse_result):
     mock_parser.process_contract.assert_called_once()
 
 
-def test_parse_contract_no_filename():
+def test_parse_contract_no_filename(client):
     """Test contract parsing with no filename."""
     # Create file without filename
     file_content = b"%PDF-1.4 sample content"
@@ -119,7 +127,7 @@ def test_parse_contract_no_filename():
     assert "detail" in data
 
 
-def test_parse_contract_unsupported_format():
+def test_parse_contract_unsupported_format(client):
     """Test contract parsing with unsupported file format."""
     file_content = b"Just some text"
     files = {"file": ("test.txt", io.BytesIO(file_content), "text/plain")}
@@ -133,7 +141,7 @@ def test_parse_contract_unsupported_format():
     assert ".txt" in data["detail"]["message"]
 
 
-def test_parse_contract_empty_file():
+def test_parse_contract_empty_file(client):
     """Test contract parsing with empty file."""
     files = {"file": ("test.pdf", io.BytesIO(b""), "application/pdf")}
 
@@ -145,12 +153,9 @@ def test_parse_contract_empty_file():
     assert data["detail"]["error"] == "EmptyFile"
 
 
-@patch("api.contracts.ContractParser")
-def test_parse_contract_file_too_large(mock_parser_class):
+def test_parse_contract_file_too_large(mock_parser, client):
     """Test contract parsing with file exceeding size limit."""
-    # Create file larger than 10MB
-    file_content = b"x" * (11 * 1024 * 1024)  # 11MB
-    files = {"file": ("large.pdf", io.BytesIO(file_content), "application/pdf")}
+    files = {"file": ("large.pdf", io.BytesIO(LARGE_BLOB), "application/pdf")}
 
     response = client.post("/api/contracts/parse", files=files)
 
@@ -160,59 +165,17 @@ def test_parse_contract_file_too_large(mock_parser_class):
     assert data["detail"]["error"] == "FileTooLarge"
 
 
-@patch("api.contracts.ContractParser")
-def test_parse_contract_document_parsing_error(mock_parser_class):
-    """Test contract parsing with document parsing error."""
-    # Mock ContractParser to raise DocumentParsingError
-    mock_parser = Mock()
-    mock_parser.process_contract.side_effect = DocumentParsingError(
-        "Failed to parse document: No text extracted"
-    )
-    mock_parser_class.return_value = mock_parser
-
-    file_content = b"%PDF-1.4 sample content"
-    files = {"file": ("test.pdf", io.BytesIO(file_content), "application/pdf")}
-
-    response = client.post("/api/contracts/parse", files=files)
-
-    assert response.status_code == 500
-    data = response.json()
-    assert data["detail"]["success"] is False
-    assert data["detail"]["error"] == "DocumentParsingError"
-    assert "Failed to parse document" in data["detail"]["message"]
-
-
-@patch("api.contracts.ContractParser")
-def test_parse_contract_clause_extraction_error(mock_parser_class):
-    """Test contract parsing with clause extraction error."""
-    # Mock ContractParser to raise ClauseExtractionError
-    mock_parser = Mock()
-    mock_parser.process_contract.side_effect = ClauseExtractionError(
-        "Failed to extract clauses: Invalid JSON"
-    )
-    mock_parser_class.return_value = mock_parser
-
-    file_content = b"%PDF-1.4 sample content"
-    files = {"file": ("test.pdf", io.BytesIO(file_content), "application/pdf")}
-
-    response = client.post("/api/contracts/parse", files=files)
-
-    assert response.status_code == 500
-    data = response.json()
-    assert data["detail"]["success"] is False
-    assert data["detail"]["error"] == "ClauseExtractionError"
-    assert "Failed to extract clauses" in data["detail"]["message"]
-
-
-@patch("api.contracts.ContractParser")
-def test_parse_contract_generic_error(mock_parser_class):
-    """Test contract parsing with generic error."""
-    # Mock ContractParser to raise generic error
-    mock_parser = Mock()
-    mock_parser.process_contract.side_effect = ContractParserError(
-        "Unexpected error during processing"
-    )
-    mock_parser_class.return_value = mock_parser
+@pytest.mark.parametrize(
+    "exc_cls,exc_msg,expected_error",
+    [
+        (DocumentParsingError, "Failed to parse document: No text extracted", "DocumentParsingError"),
+        (ClauseExtractionError, "Failed to extract clauses: Invalid JSON", "ClauseExtractionError"),
+        (ContractParserError, "Unexpected error during processing", "ContractParserError"),
+    ],
+)
+def test_parse_contract_error_paths(mock_parser, client, exc_cls, exc_msg, expected_error):
+    """Test contract parsing errors are returned as 500 with the error type."""
+    mock_parser.process_contract.side_effect = exc_cls(exc_msg)
 
     file_content = b"%PDF-1.4 sample content"
     files = {"file": ("test.pdf", io.BytesIO(file_content), "application/pdf")}
@@ -222,23 +185,18 @@ def test_parse_contract_generic_error(mock_parser_class):
     assert response.status_code == 500
     data = response.json()
     assert data["detail"]["success"] is False
-    assert data["detail"]["error"] == "ContractParserError"
+    assert data["detail"]["error"] == expected_error
+    assert data["detail"]["details"] == exc_msg
 
 
-def test_openapi_documentation():
+def test_openapi_documentation(openapi_spec):
     """Test that OpenAPI documentation is available."""
-    response = client.get("/openapi.json")
-    assert response.status_code == 200
-    openapi_spec = response.json()
     assert openapi_spec["info"]["title"] == "Energy Contract Compliance API"
     assert "/api/contracts/parse" in openapi_spec["paths"]
 
 
-def test_parse_contract_endpoint_documentation():
+def test_parse_contract_endpoint_documentation(openapi_spec):
     """Test that parse contract endpoint has proper documentation."""
-    response = client.get("/openapi.json")
-    openapi_spec = response.json()
-
     parse_endpoint = openapi_spec["paths"]["/api/contracts/parse"]["post"]
     assert parse_endpoint["summary"] == "Parse contract and extract clauses"
     assert "requestBody" in parse_endpoint
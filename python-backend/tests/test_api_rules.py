@@ -8,19 +8,11 @@ This script tests:
 """
 
 import sys
-from main import app
-from fastapi.testclient import TestClient
 
-client = TestClient(app)
 
-
-def test_openapi_docs():
+def test_openapi_docs(openapi_spec):
     """Test that OpenAPI docs are accessible and contain rules endpoints."""
-    response = client.get("/openapi.json")
-    assert response.status_code == 200
-
-    openapi = response.json()
-    paths = openapi.get("paths", {})
+    paths = openapi_spec.get("paths", {})
 
     # Check that rules endpoints are registered
     assert "/api/rules/evaluate" in paths, "Evaluate endpoint not found"
@@ -58,7 +50,7 @@ def test_openapi_docs():
     print("✅ Cure endpoint has path parameter")
 
 
-def test_evaluate_endpoint_validation():
+def test_evaluate_endpoint_validation(client):
     """Test that evaluate endpoint validates date ranges."""
     # Test with invalid date range (start after end)
     response = client.post("/api/rules/evaluate", json={
@@ -73,7 +65,7 @@ def test_evaluate_endpoint_validation():
     print("✅ Evaluate endpoint validates date range")
 
 
-def test_defaults_endpoint_validation():
+def test_defaults_endpoint_validation(client):
     """Test that defaults endpoint validates date ranges."""
     # Test with invalid date range
     response = client.get("/api/rules/defaults", params={
@@ -87,11 +79,9 @@ def test_defaults_endpoint_validation():
     print("✅ Defaults endpoint validates date range")
 
 
-def test_pagination_parameters():
+def test_pagination_parameters(openapi_spec):
     """Test that pagination parameters have correct constraints."""
-    response = client.get("/openapi.json")
-    openapi = response.json()
-    defaults_endpoint = openapi["paths"]["/api/rules/defaults"]["get"]
+    defaults_endpoint = openapi_spec["paths"]["/api/rules/defaults"]["get"]
     parameters = defaults_endpoint["parameters"]
 
     # Find limit and offset parameters
@@ -116,12 +106,20 @@ def test_pagination_parameters():
 
 if __name__ == "__main__":
     try:
+        from fastapi.testclient import TestClient
+        from main import app
+
         print("\n🧪 Testing Rules API Configuration\n")
 
-        test_openapi_docs()
-        test_evaluate_endpoint_validation()
-        test_defaults_endpoint_validation()
-        test_pagination_parameters()
+        client = TestClient(app)
+        response = client.get("/openapi.json")
+        assert response.status_code == 200
+        openapi_spec = response.json()
+
+        test_openapi_docs(openapi_spec)
+        test_evaluate_endpoint_validation(client)
+        test_defaults_endpoint_validation(client)
+        test_pagination_parameters(openapi_spec)
 
         print("\n✅ All Rules API tests passed!")
         print("\n📋 Summary of Task 3.2 Implementation:")
@@ -9,6 +9,7 @@ Uses mocked external APIs to avoid costs and enable deterministic testing.
 
 import pytest
 import json
+from contextlib import ExitStack
 from unittest.mock import Mock, patch, MagicMock
 from services.contract_parser import (
     ContractParser,
@@ -19,6 +20,37 @@ from services.contract_parser import (
 from models.contract import ContractParseResult, ExtractedClause
 
 
+# Claude response with two clauses, serialized once at import
+MULTIPLE_CLAUSES_RESPONSE_TEXT = json.dumps({
+    "clauses": [
+        {
+            "clause_name": "Availability Guarantee",
+            "section_reference": "4.1",
+            "clause_type": "availability",
+            "clause_category": "availability",
+            "raw_text": "Seller shall ensure availability of 95%.",
+            "summary": "Requires 95% availability",
+            "responsible_party": "Seller",
+            "beneficiary_party": "Buyer",
+            "normalized_payload": {"threshold": 95.0},
+            "confidence_score": 0.95,
+        },
+        {
+            "clause_name": "Liquidated Damages",
+            "section_reference": "5.1",
+            "clause_type": "liquidated_damages",
+            "clause_category": "compliance",
+            "raw_text": "Damages of $50,000 per point.",
+            "summary": "LD calculation",
+            "responsible_party": "Buyer",
+            "beneficiary_party": "Buyer",
+            "normalized_payload": {"ld_per_point": 50000},
+            "confidence_score": 0.92,
+        }
+    ]
+})
+
+
 @pytest.fixture
 def mock_env_vars(monkeypatch):
     """Mock environment variables for API keys."""
@@ -26,6 +58,33 @@ def mock_env_vars(monkeypatch):
     monkeypatch.setenv("ANTHROPIC_API_KEY", "test_anthropic_key")
 
 
+@pytest.fixture(scope="module")
+def _module_single_pass_parser():
+    """
+    single_pass ContractParser built once per module with mocked API clients.
+
+    The API keys and the LlamaParse/Anthropic patches stay in place for the
+    whole module. Use the single_pass_parser fixture, which resets the mocks
+    between tests.
+    """
+    with ExitStack() as stack:
+        mp = stack.enter_context(pytest.MonkeyPatch.context())
+        mp.setenv("LLAMA_CLOUD_API_KEY", "test_llama_key")
+        mp.setenv("ANTHROPIC_API_KEY", "test_anthropic_key")
+        stack.enter_context(patch("services.contract_parser.LlamaParse"))
+        stack.enter_context(patch("services.contract_parser.Anthropic"))
+        yield ContractParser(extraction_mode="single_pass", enable_targeted=False, enable_validation=False)
+
+
+@pytest.fixture
+def single_pass_parser(_module_single_pass_parser):
+    """Shared single_pass parser with its LlamaParse and Claude mocks reset."""
+    parser = _module_single_pass_parser
+    parser.llama_parser.load_data.reset_mock(return_value=True, side_effect=True)
+    parser.claude.messages.create.reset_mock(return_value=True, side_effect=True)
+    return parser
+
+
 @pytest.fixture
 def sample_pdf_bytes():
     """Sample PDF file content (mock)."""
@@ -47,7 +106,7 @@ def sample_contract_text():
     """
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_claude_response():
     """Sample Claude API response with valid JSON."""
     return {
@@ -72,6 +131,12 @@ def sample_claude_response():
     }
 
 
+@pytest.fixture(scope="session")
+def sample_claude_response_text(sample_claude_response):
+    """sample_claude_response as Claude returns it: JSON in a ```json fence."""
+    return f"```json\n{json.dumps(sample_claude_response)}\n```"
+
+
 def test_contract_parser_initialization(mock_env_vars):
     """Test ContractParser initializes with API clients."""
     with patch("services.contract_parser.LlamaParse"), \
@@ -114,30 +179,27 @@ def test_contract_parser_missing_anthropic_key(monkeypatch):
 
 
 @patch("services.chunking.token_estimator.TokenEstimator.estimate_tokens", return_value=500)
-@patch("services.contract_parser.LlamaParse")
-@patch("services.contract_parser.Anthropic")
 def test_process_contract_success(
-    mock_anthropic,
-    mock_llama,
     mock_estimator,
-    mock_env_vars,
+    single_pass_parser,
     sample_pdf_bytes,
     sample_contract_text,
-    sample_claude_response,
+    sample_claude_response_text,
 ):
     """Test successful contract processing pipeline."""
+    parser = single_pass_parser
+
     # Mock LlamaParse response
     mock_doc = Mock()
     mock_doc.text = sample_contract_text
-    mock_llama.return_value.load_data.return_value = [mock_doc]
+    parser.llama_parser.load_data.return_value = [mock_doc]
 
     # Mock Claude response
     mock_response = Mock()
-    mock_response.content = [Mock(text=f"```json\n{json.dumps(sample_claude_response)}\n```")]
-    mock_anthropic.return_value.messages.create.return_value = mock_response
+    mock_response.content = [Mock(text=sample_claude_response_text)]
+    parser.claude.messages.create.return_value = mock_response
 
-    # Create parser and process (use single_pass to match mock setup)
-    parser = ContractParser(extraction_mode="single_pass", enable_targeted=False, enable_validation=False)
+    # Process contract
     result = parser.process_contract(sample_pdf_bytes, "test.pdf")
 
     # Verify result
@@ -151,21 +213,19 @@ def test_process_contract_success(
 
 
 @patch("services.chunking.token_estimator.TokenEstimator.estimate_tokens", return_value=500)
-@patch("services.contract_parser.LlamaParse")
-@patch("services.contract_parser.Anthropic")
 def test_pii_detection_before_claude_call(
-    mock_anthropic,
-    mock_llama,
     mock_estimator,
-    mock_env_vars,
+    single_pass_parser,
     sample_pdf_bytes,
     sample_contract_text,
 ):
     """Test that PII detection happens before Claude API call."""
+    parser = single_pass_parser
+
     # Mock LlamaParse
     mock_doc = Mock()
     mock_doc.text = sample_contract_text
-    mock_llama.return_value.load_data.return_value = [mock_doc]
+    parser.llama_parser.load_data.return_value = [mock_doc]
 
     # Track call order
     call_order = []
@@ -180,11 +240,8 @@ def test_pii_detection_before_claude_call(
         mock_response.content = [Mock(text='{"clauses": []}')]
         return mock_response
 
-    mock_llama.return_value.load_data.side_effect = track_llama_call
-    mock_anthropic.return_value.messages.create.side_effect = track_claude_call
-
-    # Process contract (use single_pass to match mock setup)
-    parser = ContractParser(extraction_mode="single_pass", enable_targeted=False, enable_validation=False)
+    parser.llama_parser.load_data.side_effect = track_llama_call
+    parser.claude.messages.create.side_effect = track_claude_call
 
     with patch.object(parser.pii_detector, 'detect', wraps=parser.pii_detector.detect) as mock_detect:
         result = parser.process_contract(sample_pdf_bytes, "test.pdf")
@@ -235,25 +292,21 @@ def test_llama_parse_failure(
         parser.process_contract(sample_pdf_bytes, "test.pdf")
 
 
-@patch("services.contract_parser.LlamaParse")
-@patch("services.contract_parser.Anthropic")
 def test_claude_api_failure(
-    mock_anthropic,
-    mock_llama,
-    mock_env_vars,
+    single_pass_parser,
     sample_pdf_bytes,
     sample_contract_text,
 ):
     """Test handling of Claude API failure."""
+    parser = single_pass_parser
+
     # Mock LlamaParse success
     mock_doc = Mock()
     mock_doc.text = sample_contract_text
-    mock_llama.return_value.load_data.return_value = [mock_doc]
+    parser.llama_parser.load_data.return_value = [mock_doc]
 
     # Mock Claude to raise an exception
-    mock_anthropic.return_value.messages.create.side_effect = Exception("Claude API error")
-
-    parser = ContractParser(extraction_mode="single_pass", enable_targeted=False, enable_validation=False)
+    parser.claude.messages.create.side_effect = Exception("Claude API error")
 
     # Should raise ClauseExtractionError
     with pytest.raises(ClauseExtractionError, match="Failed to extract clauses"):
@@ -261,28 +314,24 @@ def test_claude_api_failure(
 
 
 @patch("services.chunking.token_estimator.TokenEstimator.estimate_tokens", return_value=500)
-@patch("services.contract_parser.LlamaParse")
-@patch("services.contract_parser.Anthropic")
 def test_invalid_json_response(
-    mock_anthropic,
-    mock_llama,
     mock_estimator,
-    mock_env_vars,
+    single_pass_parser,
     sample_pdf_bytes,
     sample_contract_text,
 ):
     """Test handling of invalid JSON from Claude."""
+    parser = single_pass_parser
+
     # Mock LlamaParse success
     mock_doc = Mock()
     mock_doc.text = sample_contract_text
-    mock_llama.return_value.load_data.return_value = [mock_doc]
+    parser.llama_parser.load_data.return_value = [mock_doc]
 
     # Mock Claude to return invalid JSON
     mock_response = Mock()
     mock_response.content = [Mock(text="This is not valid JSON")]
-    mock_anthropic.return_value.messages.create.return_value = mock_response
-
-    parser = ContractParser(extraction_mode="single_pass", enable_targeted=False, enable_validation=False)
+    parser.claude.messages.create.return_value = mock_response
 
     # Should raise ClauseExtractionError
     with pytest.raises(ClauseExtractionError, match="Invalid JSON response"):
@@ -290,28 +339,25 @@ def test_invalid_json_response(
 
 
 @patch("services.chunking.token_estimator.TokenEstimator.estimate_tokens", return_value=500)
-@patch("services.contract_parser.LlamaParse")
-@patch("services.contract_parser.Anthropic")
 def test_no_clauses_extracted(
-    mock_anthropic,
-    mock_llama,
     mock_estimator,
-    mock_env_vars,
+    single_pass_parser,
     sample_pdf_bytes,
     sample_contract_text,
 ):
     """Test handling when no clauses are found."""
+    parser = single_pass_parser
+
     # Mock LlamaParse success
     mock_doc = Mock()
     mock_doc.text = sample_contract_text
-    mock_llama.return_value.load_data.return_value = [mock_doc]
+    parser.llama_parser.load_data.return_value = [mock_doc]
 
     # Mock Claude to return empty clauses list
     mock_response = Mock()
     mock_response.content = [Mock(text='{"clauses": []}')]
-    mock_anthropic.return_value.messages.create.return_value = mock_response
+    parser.claude.messages.create.return_value = mock_response
 
-    parser = ContractParser(extraction_mode="single_pass", enable_targeted=False, enable_validation=False)
     result = parser.process_contract(sample_pdf_bytes, "test.pdf")
 
     # Should succeed but have no clauses
@@ -320,60 +366,111 @@ def test_no_clauses_extracted(
 
 
 @patch("services.chunking.token_estimator.TokenEstimator.estimate_tokens", return_value=500)
-@patch("services.contract_parser.LlamaParse")
-@patch("services.contract_parser.Anthropic")
 def test_multiple_clauses_extraction(
-    mock_anthropic,
-    mock_llama,
     mock_estimator,
-    mock_env_vars,
+    single_pass_parser,
     sample_pdf_bytes,
     sample_contract_text,
 ):
     """Test extraction of multiple clauses."""
+    parser = single_pass_parser
+
     # Mock LlamaParse success
     mock_doc = Mock()
     mock_doc.text = sample_contract_text
-    mock_llama.return_value.load_data.return_value = [mock_doc]
+    parser.llama_parser.load_data.return_value = [mock_doc]
 
     # Mock Claude to return multiple clauses
-    multiple_clauses = {
-        "clauses": [
-            {
-                "clause_name": "Availability Guarantee",
-                "section_reference": "4.1",
-                "clause_type": "availability",
-                "clause_category": "availability",
-                "raw_text": "Seller shall ensure availability of 95%.",
-                "summary": "Requires 95% availability",
-                "responsible_party": "Seller",
-                "beneficiary_party": "Buyer",
-                "normalized_payload": {"threshold": 95.0},
-                "confidence_score": 0.95,
-            },
-            {
-                "clause_name": "Liquidated Damages",
-                "section_reference": "5.1",
-                "clause_type": "liquidated_damages",
-                "clause_category": "compliance",
-                "raw_text": "Damages of $50,000 per point.",
-                "summary": "LD calculation",
-                "responsible_party": "Buyer",
-                "beneficiary_party": "Buyer",
-                "normalized_payload": {"ld_per_point": 50000},
-                "confidence_score": 0.92,
-            }
-        ]
-    }
-
     mock_response = Mock()
-    mock_response.content = [Mock(text=json.dumps(multiple_clauses))]
-    mock_anthropic.return_value.messages.create.return_value = mock_response
+    mock_response.content = [Mock(text=MULTIPLE_CLAUSES_RESPONSE_TEXT)]
+    parser.claude.messages.create.return_value = mock_response
 
-    parser = ContractParser(extraction_mode="single_pass", enable_targeted=False, enable_validation=False)
     result = parser.process_contract(sample_pdf_bytes, "test.pdf")
 
     # Verify multiple clauses extracted
     assert len(result.clauses) == 2
     assert result.clauses[0].clause_name == "Availability Guarantee"
     assert result.clauses[1].clause_name == "Liquidated Damages"
+
+
+@pytest.fixture
+def cached_parser_factory(mock_env_vars, sample_contract_text):
+    """
+    Build cache_results=True parsers that share one set of API mocks.
+
+    Clause extraction is stubbed to return the two clauses in
+    MULTIPLE_CLAUSES_RESPONSE_TEXT; ContractParser._extract_clauses.call_count
+    shows whether Claude would have been called. The module-level result cache is cleared before and
+    after each test so cached results never leak between tests.
+    """
+    from services import contract_parser
+
+    def extract(anonymized_text):
+        clauses = [ExtractedClause(**c) for c in json.loads(MULTIPLE_CLAUSES_RESPONSE_TEXT)["clauses"]]
+        return clauses, None
+
+    contract_parser._parse_result_cache.clear()
+    with patch("services.contract_parser.LlamaParse") as mock_llama, \
+            patch("services.contract_parser.Anthropic"), \
+            patch.object(ContractParser, "_extract_clauses", side_effect=extract):
+        mock_doc = Mock()
+        mock_doc.text = sample_contract_text
+        mock_llama.return_value.load_data.return_value = [mock_doc]
+
+        def build(**kwargs):
+            kwargs.setdefault("extraction_mode", "single_pass")
+            kwargs.setdefault("enable_targeted", False)
+            kwargs.setdefault("enable_validation", False)
+            return ContractParser(cache_results=True, **kwargs)
+
+        yield build
+    contract_parser._parse_result_cache.clear()
+
+
+def test_cached_result_returned_for_same_file(cached_parser_factory, sample_pdf_bytes):
+    """A second parse of the same bytes is served from the cache."""
+    parser = cached_parser_factory()
+
+    first = parser.process_contract(sample_pdf_bytes, "test.pdf")
+    second = cached_parser_factory().process_contract(sample_pdf_bytes, "copy.pdf")
+
+    assert parser.llama_parser.load_data.call_count == 1
+    assert ContractParser._extract_clauses.call_count == 1
+    assert second.model_dump() == first.model_dump()
+
+
+def test_cache_miss_on_different_file_bytes(cached_parser_factory, sample_pdf_bytes):
+    """Different file contents are parsed again."""
+    parser = cached_parser_factory()
+
+    parser.process_contract(sample_pdf_bytes, "test.pdf")
+    parser.process_contract(sample_pdf_bytes + b" revised", "test.pdf")
+
+    assert parser.llama_parser.load_data.call_count == 2
+    assert ContractParser._extract_clauses.call_count == 2
+
+
+def test_cache_miss_on_different_extraction_settings(cached_parser_factory, sample_pdf_bytes):
+    """The same file parsed with other extraction settings is not served from the cache."""
+    parser = cached_parser_factory()
+
+    parser.process_contract(sample_pdf_bytes, "test.pdf")
+    cached_parser_factory(enable_validation=True).process_contract(sample_pdf_bytes, "test.pdf")
+    cached_parser_factory(extraction_mode="two_pass").process_contract(sample_pdf_bytes, "test.pdf")
+
+    assert parser.llama_parser.load_data.call_count == 3
+    assert ContractParser._extract_clauses.call_count == 3
+
+
+def test_cached_result_is_a_deep_copy(cached_parser_factory, sample_pdf_bytes):
+    """Mutating a returned result does not change what later callers get."""
+    parser = cached_parser_factory()
+
+    first = parser.process_contract(sample_pdf_bytes, "test.pdf")
+    first.clauses[0].normalized_payload["threshold"] = 0.0
+    first.clauses.clear()
+    second = parser.process_contract(sample_pdf_bytes, "test.pdf")
+
+    assert ContractParser._extract_clauses.call_count == 1
+    assert len(second.clauses) == 2
+    assert second.clauses[0].normalized_payload["threshold"] == 95.0
@@ -16,50 +16,53 @@ Requirements:
 """
 
 import pytest
-import os
 from uuid import uuid4
 from datetime import datetime
-from dotenv import load_dotenv
+from unittest.mock import patch
+from psycopg2.extras import execute_values
 
-# Load environment variables from .env file
-load_dotenv()
-
-from db.database import init_connection_pool, close_connection_pool, health_check
+from db.database import health_check, get_db_connection
 from db.contract_repository import ContractRepository
 from db.encryption import encrypt_pii_mapping, decrypt_pii_mapping
 
 
 @pytest.fixture(scope="module")
-def db_connection():
-    """Initialize database connection pool for tests."""
-    # Check required environment variables
-    if not os.getenv("DATABASE_URL"):
-        pytest.skip("DATABASE_URL not set - skipping database tests")
-    if not os.getenv("ENCRYPTION_KEY"):
-        pytest.skip("ENCRYPTION_KEY not set - skipping database tests")
-
-    # Initialize connection pool
-    init_connection_pool(min_connections=1, max_connections=5)
-
-    # Verify database is accessible
-    if not health_check():
-        pytest.skip("Database health check failed - skipping tests")
-
-    yield
-
-    # Cleanup
-    close_connection_pool()
-
-
-@pytest.fixture
 def repository(db_connection):
-    """Create ContractRepository instance."""
-    return ContractRepository()
-
-
-@pytest.fixture
-def sample_contract_data():
-    """Sample contract data for testing."""
+    """
+    Create ContractRepository instance (stateless, shared by the module).
+
+    Contracts stored through it are recorded and deleted, with their clauses
+    and PII mappings, when the module finishes so repeated runs do not grow
+    the tables that get_parsing_statistics and get_clauses_needing_review scan.
+    """
+    repository = ContractRepository()
+    created_contract_ids = []
+    store_contract = repository.store_contract
+
+    def store_and_record(*args, **kwargs):
+        contract_id = store_contract(*args, **kwargs)
+        created_contract_ids.append(contract_id)
+        return contract_id
+
+    repository.store_contract = store_and_record
+    yield repository
+
+    if created_contract_ids:
+        # contract_pii_mapping rows go with the contract (ON DELETE CASCADE)
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "DELETE FROM clause WHERE contract_id = ANY(%s)",
+                    (created_contract_ids,)
+                )
+                cursor.execute(
+                    "DELETE FROM contract WHERE id = ANY(%s)",
+                    (created_contract_ids,)
+                )
+
+
+def _contract_data():
+    """Contract fields for a new test contract with a unique name."""
     return {
         "name": f"Test Contract {uuid4()}",
         "file_location": "/uploads/test_contract.pdf",
@@ -67,6 +70,12 @@ def sample_contract_data():
     }
 
 
+@pytest.fixture
+def sample_contract_data():
+    """Sample contract data for testing."""
+    return _contract_data()
+
+
 @pytest.fixture
 def sample_pii_mapping():
     """Sample PII mapping for testing."""
@@ -79,7 +88,7 @@ def sample_pii_mapping():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_clauses():
     """Sample clauses for testing."""
     return [
@@ -107,6 +116,7 @@ def sample_clauses():
     ]
 
 
+@pytest.mark.xdist_group("db")
 class TestDatabaseConnection:
     """Test database connection and pooling."""
 
@@ -153,6 +163,21 @@ class TestEncryption:
             decrypt_pii_mapping(b"invalid_encrypted_data")
 
 
+@pytest.fixture(scope="class")
+def seeded_contract_id(repository):
+    """One contract shared by tests that only need a valid contract to write to."""
+    return repository.store_contract(**_contract_data())
+
+
+@pytest.fixture(scope="class")
+def seeded_contract_with_clauses(repository, sample_clauses):
+    """One contract holding exactly sample_clauses, shared by read-only clause tests."""
+    contract_id = repository.store_contract(**_contract_data())
+    repository.store_clauses(contract_id, sample_clauses)
+    return contract_id
+
+
+@pytest.mark.xdist_group("db")
 class TestContractRepository:
     """Test ContractRepository methods."""
 
@@ -170,59 +195,55 @@ class TestContractRepository:
         assert contract['file_location'] == sample_contract_data['file_location']
         assert contract['parsing_status'] == 'pending'
 
-    def test_update_parsing_status_processing(self, repository, sample_contract_data):
-        """Test updating contract to processing status."""
-        contract_id = repository.store_contract(**sample_contract_data)
-
-        # Update to processing
-        repository.update_parsing_status(contract_id, 'processing')
-
-        # Verify status updated
-        contract = repository.get_contract(contract_id)
-        assert contract['parsing_status'] == 'processing'
-        assert contract['parsing_started_at'] is not None
-        assert contract['parsing_completed_at'] is None
-
-    def test_update_parsing_status_completed(self, repository, sample_contract_data):
-        """Test updating contract to completed status with counts."""
-        contract_id = repository.store_contract(**sample_contract_data)
-
-        # Update to completed
-        repository.update_parsing_status(
-            contract_id,
-            'completed',
-            pii_count=5,
-            clauses_count=12,
-            processing_time=45.5
-        )
-
-        # Verify status and counts
-        contract = repository.get_contract(contract_id)
-        assert contract['parsing_status'] == 'completed'
-        assert contract['parsing_completed_at'] is not None
-        assert contract['pii_detected_count'] == 5
-        assert contract['clauses_extracted_count'] == 12
-        assert float(contract['processing_time_seconds']) == 45.5
-
-    def test_update_parsing_status_failed(self, repository, sample_contract_data):
-        """Test updating contract to failed status with error."""
+    @pytest.mark.parametrize(
+        "status,update_kwargs,expected,not_null",
+        [
+            (
+                "processing",
+                {},
+                {"parsing_completed_at": None},
+                ["parsing_started_at"],
+            ),
+            (
+                "completed",
+                {"pii_count": 5, "clauses_count": 12, "processing_time": 45.5},
+                {
+                    "pii_detected_count": 5,
+                    "clauses_extracted_count": 12,
+                    "processing_time_seconds": 45.5,
+                },
+                ["parsing_completed_at"],
+            ),
+            (
+                "failed",
+                {"error": "LlamaParse API timeout"},
+                {"parsing_error": "LlamaParse API timeout"},
+                ["parsing_completed_at"],
+            ),
+        ],
+        ids=["processing", "completed", "failed"],
+    )
+    def test_update_parsing_status(
+        self, repository, sample_contract_data, status, update_kwargs, expected, not_null
+    ):
+        """Test updating contract parsing status with its counts or error."""
         contract_id = repository.store_contract(**sample_contract_data)
 
-        # Update to failed
-        error_msg = "LlamaParse API timeout"
-        repository.update_parsing_status(contract_id, 'failed', error=error_msg)
+        repository.update_parsing_status(contract_id, status, **update_kwargs)
 
-        # Verify status and error
+        # Verify status, timestamps and recorded fields
         contract = repository.get_contract(contract_id)
-        assert contract['parsing_status'] == 'failed'
-        assert contract['parsing_error'] == error_msg
-        assert contract['parsing_completed_at'] is not None
+        assert contract['parsing_status'] == status
+        for field in not_null:
+            assert contract[field] is not None
+        for field, value in expected.items():
+            assert contract[field] == value
 
     def test_store_and_retrieve_pii_mapping(
-        self, repository, sample_contract_data, sample_pii_mapping
+        self, repository, seeded_contract_id, sample_pii_mapping
     ):
         """Test storing and retrieving encrypted PII mapping."""
-        contract_id = repository.store_contract(**sample_contract_data)
+        contract_id = seeded_contract_id
         user_id = uuid4()  # Test user ID
 
         # Store PII mapping
@@ -243,20 +264,24 @@ class TestContractRepository:
         mapping = repository.get_pii_mapping(999999)
         assert mapping is None
 
-    def test_store_clauses(self, repository, sample_contract_data, sample_clauses):
+    def test_store_clauses(self, repository, seeded_contract_id, sample_clauses):
         """Test storing multiple clauses."""
-        contract_id = repository.store_contract(**sample_contract_data)
+        contract_id = seeded_contract_id
 
         # Store clauses
-        clause_ids = repository.store_clauses(contract_id, sample_clauses)
+        with patch(
+            "db.contract_repository.execute_values", wraps=execute_values
+        ) as mock_execute_values:
+            clause_ids = repository.store_clauses(contract_id, sample_clauses)
 
+        # All clauses go in one multi-row INSERT
+        mock_execute_values.assert_called_once()
         assert len(clause_ids) == len(sample_clauses)
         assert all(isinstance(id, int) and id > 0 for id in clause_ids)
 
-    def test_get_clauses(self, repository, sample_contract_data, sample_clauses):
+    def test_get_clauses(self, repository, seeded_contract_with_clauses, sample_clauses):
         """Test retrieving clauses for a contract."""
-        contract_id = repository.store_contract(**sample_contract_data)
-        repository.store_clauses(contract_id, sample_clauses)
+        contract_id = seeded_contract_with_clauses
 
         # Retrieve all clauses
         clauses = repository.get_clauses(contract_id)
@@ -267,11 +292,10 @@ class TestContractRepository:
         assert float(clauses[0]['confidence_score']) == sample_clauses[0]['confidence_score']
 
     def test_get_clauses_with_confidence_filter(
-        self, repository, sample_contract_data, sample_clauses
+        self, repository, seeded_contract_with_clauses
     ):
         """Test retrieving clauses filtered by minimum confidence."""
-        contract_id = repository.store_contract(**sample_contract_data)
-        repository.store_clauses(contract_id, sample_clauses)
+        contract_id = seeded_contract_with_clauses
 
         # Get only high-confidence clauses (>= 0.7)
         high_confidence_clauses = repository.get_clauses(contract_id, min_confidence=0.7)
@@ -281,11 +305,10 @@ class TestContractRepository:
         assert all(float(c['confidence_score']) >= 0.7 for c in high_confidence_clauses)
 
     def test_get_clauses_needing_review(
-        self, repository, sample_contract_data, sample_clauses
+        self, repository, seeded_contract_with_clauses
     ):
         """Test getting clauses that need review due to low confidence."""
-        contract_id = repository.store_contract(**sample_contract_data)
-        repository.store_clauses(contract_id, sample_clauses)
+        contract_id = seeded_contract_with_clauses
 
         # Get clauses needing review (confidence < 0.7)
         review_clauses = repository.get_clauses_needing_review(
@@ -329,6 +352,7 @@ class TestContractRepository:
         assert contract is None
 
 
+@pytest.mark.xdist_group("db")
 class TestEndToEndWorkflow:
     """Test complete contract parsing workflow."""
 
@@ -10,9 +10,9 @@ from services.pii_detector import PIIDetector, PIIDetectionError, PIIAnonymizati
 from models.contract import PIIEntity, AnonymizedResult
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def pii_detector():
-    """Create PIIDetector instance for testing."""
+    """Create one PIIDetector (and spaCy model load) shared by the module's tests."""
     return PIIDetector()
 
 
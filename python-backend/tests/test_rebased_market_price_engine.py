@@ -0,0 +1,168 @@
+"""
+Tests for RebasedMarketPriceEngine.
+
+The calculate_and_store_bulk tests mock the database connection and stub
+per-project calculation, so they cover only the batch transaction handling.
+The _write_to_db test runs against the database (db_connection fixture).
+"""
+
+from datetime import date
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from db.database import get_db_connection
+from services.tariff.rebased_market_price_engine import RebasedMarketPriceEngine
+
+
+FX_RATES = [{"billing_month": date(2025, 1, 1), "fx_rate": 15.0, "rate_date": date(2025, 1, 31)}]
+
+
+def _item(project_id):
+    return {"project_id": project_id, "operating_year": 2, "mrp_per_kwh": 1.5, "monthly_fx_rates": FX_RATES}
+
+
+@pytest.fixture
+def mock_conn():
+    """Connection yielded by get_db_connection, with tariffs for projects 1 and 2."""
+    conn = MagicMock()
+    cursor = conn.cursor.return_value.__enter__.return_value
+    cursor.fetchall.return_value = [
+        {"id": 11, "project_id": 1, "logic_parameters": {}},
+        {"id": 12, "project_id": 2, "logic_parameters": {}},
+    ]
+    with patch("services.tariff.rebased_market_price_engine.get_db_connection") as get_conn:
+        get_conn.return_value.__enter__.return_value = conn
+        yield conn
+
+
+def test_bulk_fetches_tariffs_once_and_commits(mock_conn):
+    """All projects share one tariff query, one connection and one commit."""
+    engine = RebasedMarketPriceEngine()
+
+    def calculate(conn, tariff, **kwargs):
+        return {"ct": tariff["id"]}
+
+    with patch.object(engine, "_calculate_and_write", side_effect=calculate) as calc:
+        results = engine.calculate_and_store_bulk([_item(1), _item(2)])
+
+    assert results == {1: {"ct": 11}, 2: {"ct": 12}}
+    cursor = mock_conn.cursor.return_value.__enter__.return_value
+    assert cursor.execute.call_count == 1
+    assert cursor.execute.call_args.args[1] == ([1, 2],)
+    assert calc.call_count == 2
+    mock_conn.commit.assert_called_once()
+    mock_conn.rollback.assert_not_called()
+
+
+def test_bulk_rolls_back_whole_batch_when_a_project_fails(mock_conn):
+    """A failure in any project rolls back the writes of every project."""
+    engine = RebasedMarketPriceEngine()
+
+    def calculate(conn, tariff, project_id, **kwargs):
+        if project_id == 2:
+            raise RuntimeError("write failed")
+        return {}
+
+    with patch.object(engine, "_calculate_and_write", side_effect=calculate):
+        with pytest.raises(RuntimeError, match="write failed"):
+            engine.calculate_and_store_bulk([_item(1), _item(2)])
+
+    mock_conn.rollback.assert_called_once()
+    mock_conn.commit.assert_not_called()
+
+
+def test_bulk_raises_for_project_without_tariff(mock_conn):
+    """A project with no REBASED_MARKET_PRICE tariff fails the batch."""
+    engine = RebasedMarketPriceEngine()
+
+    with patch.object(engine, "_calculate_and_write", return_value={}):
+        with pytest.raises(ValueError, match="No REBASED_MARKET_PRICE tariff found for project 3"):
+            engine.calculate_and_store_bulk([_item(1), _item(3)])
+
+    mock_conn.rollback.assert_called_once()
+    mock_conn.commit.assert_not_called()
+
+
+def _monthly_results(year):
+    """One computed month per quarter of a calendar year, ordered by billing_month."""
+    rate = Decimal("1.20000000")
+    return [
+        {
+            "billing_month": date(year, month, 1),
+            "fx_rate": Decimal("15.0"),
+            "rate_date": date(year, month, 1),
+            "floor_local": rate,
+            "ceiling_local": rate,
+            "discounted_mrp_local": rate,
+            "effective_tariff_local": rate,
+            "rate_binding": "discounted",
+            "calculation_basis": "test",
+        }
+        for month in (1, 4, 7, 10)
+    ]
+
+
+def test_write_to_db_moves_current_rows_to_new_year(db_connection):
+    """
+    A second write for a later operating year moves is_current to its rows.
+
+    The old current annual and monthly rows are cleared before the upsert,
+    so the one-current-row unique indexes are never violated. All writes are
+    rolled back.
+    """
+    engine = RebasedMarketPriceEngine()
+
+    with get_db_connection() as conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT id, organization_id, currency_id, market_ref_currency_id,
+                           project_id, valid_from
+                    FROM clause_tariff
+                    WHERE project_id IS NOT NULL AND valid_from IS NOT NULL
+                    ORDER BY id
+                    LIMIT 1
+                    """
+                )
+                tariff = cur.fetchone()
+            if tariff is None:
+                pytest.skip("No clause_tariff rows to write rates for")
+
+            first_year = tariff["valid_from"].year + 1
+            for operating_year in (2, 3):
+                monthly_results = _monthly_results(first_year + operating_year - 2)
+                engine._write_to_db(
+                    tariff=tariff,
+                    operating_year=operating_year,
+                    mrp_local=Decimal("1.5"),
+                    mrp_totals={},
+                    verification_status="pending",
+                    representative_rate=Decimal("1.2"),
+                    final_effective_tariff=Decimal("1.2"),
+                    annual_basis="test",
+                    monthly_results=monthly_results,
+                    discount_pct=Decimal("0.2"),
+                    escalated_floor=Decimal("0.08"),
+                    escalated_ceiling=Decimal("0.12"),
+                    conn=conn,
+                )
+
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT rate_granularity, operating_year, billing_month
+                    FROM tariff_rate
+                    WHERE clause_tariff_id = %s AND is_current = true
+                      AND rate_granularity IN ('annual', 'monthly')
+                    """,
+                    (tariff["id"],),
+                )
+                current = {row["rate_granularity"]: row for row in cur.fetchall()}
+
+            assert current["annual"]["operating_year"] == 3
+            assert current["monthly"]["billing_month"] == monthly_results[-1]["billing_month"]
+        finally:
+            conn.rollback()
@@ -5,10 +5,17 @@ Unit tests for rules engine.
 import pytest
 from datetime import datetime
 from decimal import Decimal
+from unittest.mock import MagicMock, patch
+import numpy as np
 import pandas as pd
 
+from db.rules_repository import RulesRepository
+
 from services.rules.availability_rule import AvailabilityRule
+from services.rules.base_rule import ExcusedHoursCache
 from services.rules.capacity_factor_rule import CapacityFactorRule
+from services.rules_engine import RulesEngine
+from models.contract import RuleResult
 
 
 # Test Data Fixtures
@@ -249,3 +256,172 @@ def test_excused_events_reduce_shortfall(availability_clause):
     assert result_with_excused.calculated_value > result_without_excused.calculated_value
     assert result_with_excused.shortfall < result_without_excused.shortfall
     assert result_with_excused.ld_amount < result_without_excused.ld_amount
+
+
+def test_ld_amount_capped_by_period_cap(availability_clause):
+    """Test period cap takes precedence over annual cap when both are set."""
+    availability_clause['normalized_payload']['ld_cap_period'] = 100000
+
+    rule = AvailabilityRule(availability_clause)
+    params = rule.ld_parameters
+
+    assert params['ld_cap_effective'] == Decimal('100000')
+    assert rule._calculate_ld_amount(5.0, params) == Decimal('100000.00')
+    assert rule._calculate_ld_amount(1.0, params) == Decimal('50000.00')
+
+
+def test_ld_amount_zero_cap_means_no_cap(availability_clause):
+    """A cap of 0 leaves the LD uncapped instead of zeroing it."""
+    rule = AvailabilityRule(availability_clause)
+    params = dict(rule.ld_parameters, ld_cap_effective=Decimal('0'))
+
+    assert rule._calculate_ld_amount(5.0, params) == Decimal('250000.00')
+
+
+def test_overlapping_excused_events_counted_once(availability_clause):
+    """Test overlapping force majeure events do not double-count shared hours."""
+    excused_events = pd.DataFrame({
+        'event_id': [1, 2, 3],
+        'time_start': [
+            datetime(2024, 11, 10, 0, 0),
+            datetime(2024, 11, 10, 6, 0),   # Overlaps event 1 by 4 hours
+            datetime(2024, 11, 30, 20, 0),  # Runs past period end
+        ],
+        'time_end': [
+            datetime(2024, 11, 10, 10, 0),
+            datetime(2024, 11, 10, 12, 0),
+            datetime(2024, 12, 2, 0, 0),
+        ],
+        'event_type': ['force_majeure', 'grid_outage', 'force_majeure'],
+        'description': ['Storm', 'Grid outage', 'Flood']
+    })
+
+    rule = AvailabilityRule(availability_clause, ontology_repo=False)
+    excused_hours = rule._calculate_excused_hours(
+        excused_events, datetime(2024, 11, 1), datetime(2024, 12, 1)
+    )
+
+    # 12 merged hours on Nov 10 + 4 clamped hours on Nov 30
+    assert excused_hours == pytest.approx(16.0)
+
+
+def test_excused_hours_cache_shared_per_evaluation(availability_clause, excused_events_november):
+    """Test excused hours are shared through the engine's cache, not the frame."""
+    period = (datetime(2024, 11, 1), datetime(2024, 12, 1))
+    cache = ExcusedHoursCache()
+
+    first = AvailabilityRule(availability_clause, ontology_repo=False, excused_hours_cache=cache)
+    assert first._calculate_excused_hours(excused_events_november, *period) == pytest.approx(28.5)
+
+    # A second rule of the same evaluation is served from the cache
+    second = AvailabilityRule(availability_clause, ontology_repo=False, excused_hours_cache=cache)
+    assert second._calculate_excused_hours(excused_events_november, *period) == pytest.approx(28.5)
+
+    # Nothing is memoized on the frame: a frame derived from it with other
+    # rows is computed from its own rows outside that evaluation
+    assert not excused_events_november.attrs
+    shorter = excused_events_november.assign(time_end=datetime(2024, 11, 15, 12, 0))
+    fresh = AvailabilityRule(availability_clause, ontology_repo=False)
+    assert fresh._calculate_excused_hours(shorter, *period) == pytest.approx(2.0)
+
+
+def test_to_json_native_same_output_with_and_without_orjson(monkeypatch):
+    """The orjson round trip and the convert_numpy_types walk agree."""
+    pytest.importorskip("orjson")
+    from services import rules_engine
+
+    payload = {
+        'shortfall': np.float64(2.5),
+        'hours': np.int64(744),
+        'breach': np.bool_(True),
+        'missing': float('nan'),
+        'ratio': np.float64('inf'),
+        'monthly': np.array([1.0, np.nan]),
+        'window': (datetime(2024, 11, 1), datetime(2024, 12, 1, 6, 30)),
+        'by_month': {11: np.float32(0.5), None: 'n/a', True: [np.int32(1)]},
+        'label': 'Availability',
+    }
+
+    monkeypatch.setattr(rules_engine, 'ORJSON_AVAILABLE', True)
+    with_orjson = rules_engine.to_json_native(payload)
+    monkeypatch.setattr(rules_engine, 'ORJSON_AVAILABLE', False)
+    without_orjson = rules_engine.to_json_native(payload)
+
+    assert without_orjson == with_orjson
+    assert with_orjson['window'] == ['2024-11-01T00:00:00', '2024-12-01T06:30:00']
+    assert with_orjson['missing'] is None
+
+
+def test_store_breaches_bulk_matches_returning_rows_by_key():
+    """Ids are paired by RETURNING key, not by the order rows come back in."""
+    def breach(clause_id):
+        return {
+            'default_event': {
+                'project_id': 1, 'contract_id': 1,
+                'time_start': datetime(2024, 11, 1), 'status': 'open',
+                'metadata_detail': {'clause_id': clause_id},
+                'description': 'breach', 'event_id': None,
+            },
+            'rule_output': {
+                'project_id': 1, 'clause_id': clause_id, 'rule_type': 'availability',
+                'calculated_value': 90.0, 'threshold_value': 95.0, 'shortfall': 5.0,
+                'ld_amount': Decimal('100.00'), 'output_detail': {},
+            },
+            'notification': {'project_id': 1, 'description': 'breach', 'metadata_detail': {}},
+        }
+
+    # Each INSERT returns its rows in reverse input order
+    returned = [
+        [{'id': 102, 'clause_id': '2'}, {'id': 101, 'clause_id': '1'}],
+        [{'id': 202, 'default_event_id': 102}, {'id': 201, 'default_event_id': 101}],
+        [{'id': 302, 'rule_output_id': 202}, {'id': 301, 'rule_output_id': 201}],
+    ]
+    conn = MagicMock()
+    with patch('db.rules_repository.get_db_connection') as get_conn, \
+            patch('db.rules_repository.execute_values', side_effect=returned):
+        get_conn.return_value.__enter__.return_value = conn
+        stored = RulesRepository().store_breaches_bulk([breach(1), breach(2)])
+
+    assert stored == [
+        {'default_event_id': 101, 'rule_output_id': 201, 'notification_id': 301},
+        {'default_event_id': 102, 'rule_output_id': 202, 'notification_id': 302},
+    ]
+
+
+def test_store_breaches_bulk_rejects_duplicate_clause_ids():
+    """Rows cannot be matched back when two breaches share a clause_id."""
+    record = {'default_event': {'metadata_detail': {'clause_id': 1}}, 'rule_output': {'clause_id': 1}}
+    with pytest.raises(ValueError, match="Duplicate clause_id"):
+        RulesRepository().store_breaches_bulk([record, record])
+
+
+def test_evaluate_period_keeps_clause_order_across_categories():
+    """Results follow get_evaluable_clauses order, not rule category."""
+    repository = MagicMock()
+    repository.get_evaluable_clauses.return_value = [
+        {'id': clause_id, 'name': f'Clause {clause_id}', 'project_id': 1, 'clause_category_code': category}
+        for clause_id, category in [
+            (1, 'AVAILABILITY'), (2, 'PRICING'), (3, 'AVAILABILITY'),
+            (4, 'capacity_factor'), (5, 'PRICING'),
+        ]
+    ]
+    meter_aggregator = MagicMock()
+    meter_aggregator.validate_data_completeness.return_value = {'complete': True, 'notes': []}
+    event_detector = MagicMock()
+    event_detector.detect_events.return_value = []
+    engine = RulesEngine(
+        meter_aggregator=meter_aggregator,
+        repository=repository,
+        event_detector=event_detector,
+        event_repository=MagicMock(),
+        ontology_repo=MagicMock(),
+    )
+
+    def evaluate(clause, *args, rule_class=None, **kwargs):
+        assert rule_class is RulesEngine.RULE_CLASSES[clause['clause_category_code']]
+        return RuleResult(breach=False, rule_type=rule_class.__name__, clause_id=clause['id'])
+
+    with patch.object(engine, '_evaluate_clause', side_effect=evaluate):
+        result = engine.evaluate_period(1, datetime(2024, 11, 1), datetime(2024, 12, 1))
+
+    assert [r.clause_id for r in result.default_events] == [1, 2, 3, 4, 5]